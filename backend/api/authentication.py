@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+
+TOKEN_CACHE_KEY = 'auth_token:{}'
+CACHED_USER_FIELDS = (
+    'id',
+    'email',
+    'username',
+    'first_name',
+    'last_name',
+    'is_active',
+    'is_staff',
+    'is_superuser',
+)
+
+
+def get_token_cache_key(key):
+    return TOKEN_CACHE_KEY.format(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        cache_key = get_token_cache_key(key)
+        values = cache.get(cache_key)
+        if values is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(
+                cache_key,
+                {field: getattr(user, field) for field in CACHED_USER_FIELDS},
+                settings.AUTH_TOKEN_CACHE_TIMEOUT
+            )
+            return user, token
+        model = get_user_model()
+        field_names = [
+            field.attname for field in model._meta.concrete_fields
+            if field.attname in values
+        ]
+        user = model.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [values[name] for name in field_names]
+        )
+        return user, self.get_model()(key=key, user=user)
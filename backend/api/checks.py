@@ -0,0 +1,33 @@
+import os
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+LOCAL_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+def get_worker_count():
+    workers = os.getenv('GUNICORN_WORKERS')
+    if workers:
+        return int(workers)
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) * 2 + 1
+    return os.cpu_count() * 2 + 1
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if (
+        settings.CACHES['default']['BACKEND'] != LOCAL_CACHE_BACKEND
+        or get_worker_count() < 2
+    ):
+        return []
+    return [Error(
+        'Локальный кеш процесса при нескольких воркерах: отозванные токены '
+        'и изменённые рецепты остаются в кеше других воркеров.',
+        hint=(
+            'Задайте общий кеш через CACHE_BACKEND и CACHE_LOCATION '
+            'или запустите один воркер (GUNICORN_WORKERS=1).'
+        ),
+        id='api.E001',
+    )]
@@ -0,0 +1,49 @@
+import hashlib
+
+from django.db.models import CharField, Count, Max, Value
+from django.utils.cache import (
+    get_conditional_response,
+    patch_vary_headers,
+    quote_etag
+)
+from django.utils.http import http_date
+
+from recipes.models import Favorite, Follow, ShoppingCart
+
+USER_STATE_MODELS = (Favorite, ShoppingCart, Follow)
+
+
+def get_user_state(user):
+    if user.is_anonymous:
+        return ()
+    querysets = [
+        model.objects.filter(user=user).order_by().values('user').annotate(
+            model=Value(model._meta.model_name, output_field=CharField()),
+            count=Count('pk'),
+            last=Max('pk'),
+        ).values_list('model', 'count', 'last')
+        for model in USER_STATE_MODELS
+    ]
+    return tuple(sorted(querysets[0].union(*querysets[1:], all=True)))
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_vary_headers(response, ('Authorization',))
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=(
+            int(last_modified.timestamp()) if last_modified else None
+        ),
+    )
@@ -14,10 +14,35 @@ class RecipeFilter(FilterSet):
     is_in_shopping_cart = filters.NumberFilter(
         method='filter_is_in_shopping_cart'
     )
+    min_calories = filters.NumberFilter(
+        field_name='calories', lookup_expr='gte'
+    )
+    max_calories = filters.NumberFilter(
+        field_name='calories', lookup_expr='lte'
+    )
+    min_proteins = filters.NumberFilter(
+        field_name='proteins', lookup_expr='gte'
+    )
+    max_fats = filters.NumberFilter(field_name='fats', lookup_expr='lte')
+    max_carbohydrates = filters.NumberFilter(
+        field_name='carbohydrates', lookup_expr='lte'
+    )
+    max_cost = filters.NumberFilter(field_name='cost', lookup_expr='lte')
 
     class Meta:
         model = Recipe
-        fields = ('tags', 'author', 'is_favorited', 'is_in_shopping_cart',)
+        fields = (
+            'tags',
+            'author',
+            'is_favorited',
+            'is_in_shopping_cart',
+            'min_calories',
+            'max_calories',
+            'min_proteins',
+            'max_fats',
+            'max_carbohydrates',
+            'max_cost',
+        )
 
     def filter_is_favorited(self, queryset, name, value):
         if value and self.request.user.is_authenticated:
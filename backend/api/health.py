@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
+
+HEALTH_CACHE_KEY = 'health:ready'
+
+
+def check_database():
+    for connection in connections.all():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+
+def check_cache():
+    cache.set(HEALTH_CACHE_KEY, 1, 10)
+    if cache.get(HEALTH_CACHE_KEY) != 1:
+        raise RuntimeError('Кеш недоступен')
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+}
+
+
+def liveness():
+    return JsonResponse({'status': 'ok'})
+
+
+def readiness():
+    checks = {}
+    for name, check in CHECKS.items():
+        try:
+            check()
+        except (DatabaseError, RuntimeError) as error:
+            checks[name] = str(error)
+        else:
+            checks[name] = 'ok'
+    ready = all(result == 'ok' for result in checks.values())
+    return JsonResponse(
+        {'status': 'ok' if ready else 'unavailable', 'checks': checks},
+        status=200 if ready else 503,
+        json_dumps_params={'ensure_ascii': False}
+    )
@@ -0,0 +1,68 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TOP = 20
+
+
+class Command(BaseCommand):
+    help = 'Самые затратные SQL-запросы из журнала медленных запросов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default=settings.SLOW_QUERY_LOG,
+            help='Путь к журналу медленных запросов.'
+        )
+        parser.add_argument('--top', type=int, default=TOP)
+        parser.add_argument(
+            '--explain', action='store_true',
+            help='Показать последний EXPLAIN для каждого запроса.'
+        )
+
+    def handle(self, *args, **options):
+        stats = defaultdict(lambda: {
+            'count': 0,
+            'total_ms': 0,
+            'max_ms': 0,
+            'views': set(),
+            'origins': set(),
+            'explain': None,
+        })
+        try:
+            with open(options['path'], encoding='utf-8') as log_file:
+                for line in log_file:
+                    entry = json.loads(line)
+                    item = stats[entry['fingerprint']]
+                    item['count'] += 1
+                    item['total_ms'] += entry['duration_ms']
+                    item['max_ms'] = max(item['max_ms'], entry['duration_ms'])
+                    item['views'].add(entry['view'])
+                    if entry['origin']:
+                        item['origins'].add(entry['origin'])
+                    item['explain'] = entry.get('explain') or item['explain']
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Не удалось прочитать журнал: {error}')
+        top = sorted(
+            stats.items(), key=lambda item: item[1]['total_ms'], reverse=True
+        )[:options['top']]
+        for fingerprint, item in top:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{item["total_ms"]:.1f} ms всего, {item["count"]} раз, '
+                f'в среднем {item["total_ms"] / item["count"]:.1f} ms, '
+                f'максимум {item["max_ms"]:.1f} ms'
+            ))
+            self.stdout.write(fingerprint)
+            self.stdout.write(
+                f'  представления: {", ".join(sorted(item["views"]))}'
+            )
+            if item['origins']:
+                self.stdout.write(
+                    f'  источники: {", ".join(sorted(item["origins"]))}'
+                )
+            if options['explain'] and item['explain']:
+                self.stdout.write(json.dumps(
+                    item['explain'], ensure_ascii=False, indent=2
+                ))
+            self.stdout.write('')
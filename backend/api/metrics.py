@@ -0,0 +1,72 @@
+import os
+
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+LABELS = ('method', 'view', 'status')
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUEST_LATENCY = Histogram(
+    'foodgram_request_latency_seconds',
+    'Время обработки запроса.',
+    LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_APP_TIME = Histogram(
+    'foodgram_request_app_seconds',
+    'Время обработки запроса без учёта SQL: сериализация и рендеринг.',
+    LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'foodgram_request_db_queries',
+    'Количество SQL-запросов на запрос.',
+    LABELS,
+    buckets=QUERY_BUCKETS,
+)
+DB_TIME = Histogram(
+    'foodgram_request_db_seconds',
+    'Суммарное время SQL-запросов на запрос.',
+    LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'foodgram_response_size_bytes',
+    'Размер тела ответа.',
+    LABELS,
+    buckets=SIZE_BUCKETS,
+)
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def observe(labels, latency, queries, db_time, size):
+    REQUEST_LATENCY.labels(*labels).observe(latency)
+    REQUEST_APP_TIME.labels(*labels).observe(max(latency - db_time, 0))
+    DB_QUERIES.labels(*labels).observe(queries)
+    DB_TIME.labels(*labels).observe(db_time)
+    if size is not None:
+        RESPONSE_SIZE.labels(*labels).observe(size)
+
+
+def metrics_view(request):
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,245 @@
+import logging
+import re
+import time
+import traceback
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from .health import liveness, readiness
+from .metrics import observe
+from .profiling import Profiler
+from .slow_queries import SlowQueryLogger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_MODES = ('log', 'raise')
+STACK_LIMIT = 8
+UNRESOLVED_VIEW = 'unresolved'
+BROTLI_QUALITY = 5
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/javascript',
+    'application/openapi+json',
+    'text/',
+)
+COMPRESSORS = {'gzip': compress_string}
+if brotli:
+    COMPRESSORS = {
+        'br': lambda content: brotli.compress(content, quality=BROTLI_QUALITY),
+        **COMPRESSORS,
+    }
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def get_query_budget(view_func, request):
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, 'query_budget', None)
+    actions = getattr(view_func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return getattr(view_class, 'query_budgets', {}).get(action)
+
+
+def get_project_stack():
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base_dir)
+        and not frame.filename.endswith('middleware.py')
+    ]
+    return ''.join(traceback.format_list(frames[-STACK_LIMIT:]))
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, get_project_stack()))
+        return execute(sql, params, many, context)
+
+    def duplicates(self):
+        counts = Counter(sql for sql, _ in self.queries)
+        stacks = {}
+        for sql, stack in self.queries:
+            stacks.setdefault(sql, stack)
+        return [
+            (sql, count, stacks[sql])
+            for sql, count in counts.most_common() if count > 1
+        ]
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        if settings.QUERY_BUDGET_MODE not in QUERY_BUDGET_MODES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and len(recorder.queries) > budget:
+            self.report(request, budget, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request)
+
+    def report(self, request, budget, recorder):
+        message = (
+            f'{request.method} {request.path}: {len(recorder.queries)} '
+            f'SQL-запросов при бюджете {budget}'
+        )
+        for sql, count, stack in recorder.duplicates():
+            message += f'\n\n{count}x {sql}\n{stack}'
+        if settings.QUERY_BUDGET_MODE == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        latency = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else UNRESOLVED_VIEW
+        if view != settings.METRICS_VIEW_NAME:
+            observe(
+                (request.method, view, response.status_code),
+                latency,
+                timer.count,
+                timer.duration,
+                None if response.streaming else len(response.content),
+            )
+        return response
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.profiler = Profiler()
+
+    def __call__(self, request):
+        profile = self.profiler.start(request)
+        try:
+            return self.get_response(request)
+        finally:
+            path = self.profiler.finish(request, profile)
+            if path is not None:
+                logger.warning(
+                    f'{request.method} {request.path}: профиль сохранён в '
+                    f'{path}'
+                )
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.slow_query_logger = SlowQueryLogger(
+            f'{request.method} {request.path}'
+        )
+        with connection.execute_wrapper(request.slow_query_logger):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.slow_query_logger.view = (
+            f'{request.method} {request.resolver_match.view_name}'
+        )
+
+
+class HealthCheckMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.checks = {
+            settings.HEALTH_LIVE_PATH: liveness,
+            settings.HEALTH_READY_PATH: readiness,
+        }
+
+    def __call__(self, request):
+        check = self.checks.get(request.path_info)
+        if check is not None:
+            return check()
+        return self.get_response(request)
+
+
+def get_encoding(accept_encoding):
+    for encoding in COMPRESSORS:
+        if re.search(rf'\b{encoding}\b', accept_encoding):
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        if not settings.COMPRESSION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+            or not response.get('Content-Type', '').startswith(
+                COMPRESSIBLE_TYPES
+            )
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = get_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        compressed = COMPRESSORS[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
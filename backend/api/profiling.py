@@ -0,0 +1,130 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import CachedTokenAuthentication
+
+
+def collapse_stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(
+            f'{code.co_name} ({Path(code.co_filename).name}:'
+            f'{code.co_firstlineno})'
+        )
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class RequestProfile:
+    def __init__(self, forced):
+        self.started = time.perf_counter()
+        self.forced = forced
+        self.samples = Counter()
+
+
+class StackSampler(threading.Thread):
+    def __init__(self, interval, threshold):
+        super().__init__(name='request-stack-sampler', daemon=True)
+        self.interval = interval
+        self.threshold = threshold
+        self.active = {}
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            if not self.active:
+                continue
+            now = time.perf_counter()
+            frames = sys._current_frames()
+            for thread_id, profile in list(self.active.items()):
+                frame = frames.get(thread_id)
+                if frame is not None and (
+                    profile.forced or now - profile.started >= self.threshold
+                ):
+                    profile.samples[collapse_stack(frame)] += 1
+
+
+class RateLimiter:
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self.written = []
+        self.lock = threading.Lock()
+
+    def allow(self):
+        now = time.monotonic()
+        with self.lock:
+            self.written = [
+                moment for moment in self.written if now - moment < 60
+            ]
+            if len(self.written) >= self.per_minute:
+                return False
+            self.written.append(now)
+            return True
+
+
+class Profiler:
+    def __init__(self):
+        self.pid = None
+        self.sampler = None
+        self.limiter = RateLimiter(settings.PROFILING_MAX_PER_MINUTE)
+        self.lock = threading.Lock()
+
+    def get_sampler(self):
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.sampler = StackSampler(
+                        settings.PROFILING_INTERVAL,
+                        settings.PROFILING_THRESHOLD,
+                    )
+                    self.sampler.start()
+                    self.pid = os.getpid()
+        return self.sampler
+
+    def is_forced(self, request):
+        if settings.PROFILING_HEADER not in request.META:
+            return False
+        try:
+            authenticated = CachedTokenAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return authenticated is not None and authenticated[0].is_staff
+
+    def start(self, request):
+        profile = RequestProfile(self.is_forced(request))
+        self.get_sampler().active[threading.get_ident()] = profile
+        return profile
+
+    def finish(self, request, profile):
+        self.sampler.active.pop(threading.get_ident(), None)
+        latency = time.perf_counter() - profile.started
+        if not profile.samples or not (
+            profile.forced or latency >= settings.PROFILING_THRESHOLD
+        ):
+            return None
+        if not self.limiter.allow():
+            return None
+        return self.write(request, profile, latency)
+
+    def write(self, request, profile, latency):
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^\w-]+', '_', request.path).strip('_') or 'root'
+        path = directory / (
+            f'{time.strftime("%Y%m%d-%H%M%S")}_{os.getpid()}_'
+            f'{request.method}_{slug}_{latency * 1000:.0f}ms.collapsed'
+        )
+        path.write_text(''.join(
+            f'{stack} {count}\n'
+            for stack, count in profile.samples.most_common()
+        ))
+        return path
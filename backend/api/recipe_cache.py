@@ -0,0 +1,49 @@
+import time
+
+from django.core.cache import cache
+
+RECIPE_CACHE_KEY = 'recipe:{}:{}:{}'
+RECIPE_VERSION_KEY = 'recipe_version:{}'
+CATALOG_VERSION_KEY = 'catalog_version'
+
+
+def bump_versions(keys):
+    version = time.time_ns()
+    cache.set_many({key: version for key in keys}, None)
+
+
+def bump_recipe_versions(recipe_ids):
+    bump_versions([RECIPE_VERSION_KEY.format(pk) for pk in recipe_ids])
+
+
+def bump_catalog_version():
+    bump_versions([CATALOG_VERSION_KEY])
+
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        version = time.time_ns()
+        for key in missing:
+            cache.add(key, version, None)
+        versions.update(cache.get_many(missing))
+    return '.'.join(str(versions.get(key, 0)) for key in keys)
+
+
+def get_fieldset_key(*fieldset):
+    return ';'.join(
+        '*' if names is None else ','.join(sorted(names))
+        for names in fieldset
+    )
+
+
+def get_recipe_cache_key(recipe_id, fields=None, expand=None):
+    return RECIPE_CACHE_KEY.format(
+        recipe_id,
+        get_fieldset_key(fields, expand),
+        get_versions([
+            RECIPE_VERSION_KEY.format(recipe_id),
+            CATALOG_VERSION_KEY,
+        ]),
+    )
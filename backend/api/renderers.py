@@ -0,0 +1,42 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson else 0
+)
+
+JS_UNSAFE_CHARS = (
+    (b'\xe2\x80\xa8', b'\\u2028'),
+    (b'\xe2\x80\xa9', b'\\u2029'),
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder.default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for char, escaped in JS_UNSAFE_CHARS:
+            if char in ret:
+                ret = ret.replace(char, escaped)
+        return ret
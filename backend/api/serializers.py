@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import F
 from drf_extra_fields.fields import Base64ImageField
 from django.shortcuts import get_object_or_404
@@ -14,7 +15,10 @@ from recipes.models import (
     User
 )
 
-from foodgram.settings import MIN_COOKING_TIME
+from foodgram.settings import MIN_COOKING_TIME, RECIPES_BATCH_LIMIT
+from recipes.nutrition import NUTRITION_FIELDS
+
+from .signals import invalidate_recipes, recipe_updates, recompute_nutrition
 
 
 class UserSerializer(UserSrlz):
@@ -33,8 +37,10 @@ class UserSerializer(UserSrlz):
 
     def get_is_subscribed(self, user):
         request = self.context.get('request')
-        if request.user.is_anonymous:
+        if not request or request.user.is_anonymous:
             return False
+        if hasattr(user, 'is_subscribed'):
+            return user.is_subscribed
         return user.following.filter(user=request.user).exists()
 
 
@@ -62,6 +68,8 @@ class SubscribeListSerializer(UserSerializer):
         return data
 
     def get_recipes_count(self, user):
+        if hasattr(user, 'recipes_count'):
+            return user.recipes_count
         return user.recipes.count()
 
     def get_recipes(self, user):
@@ -81,7 +89,7 @@ class TagSerializer(serializers.ModelSerializer):
 class IngredientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ingredient
-        fields = '__all__'
+        fields = ('id', 'name', 'measurement_unit')
 
 
 class IngredientRecipeSerializer(serializers.ModelSerializer):
@@ -98,7 +106,22 @@ class IngredientRecipeSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'measurement_unit', 'amount',)
 
 
+class IngredientAmountSerializer(IngredientRecipeSerializer):
+    class Meta(IngredientRecipeSerializer.Meta):
+        fields = ('id', 'amount')
+
+
+class NutritionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Recipe
+        fields = tuple(NUTRITION_FIELDS)
+        extra_kwargs = {
+            field: {'coerce_to_string': False} for field in NUTRITION_FIELDS
+        }
+
+
 class RecipeReadSerializer(serializers.ModelSerializer):
+    expandable_fields = ('author', 'ingredients', 'tags')
     tags = TagSerializer(read_only=False, many=True)
     author = UserSerializer(read_only=True, many=False)
     ingredients = IngredientRecipeSerializer(
@@ -108,6 +131,7 @@ class RecipeReadSerializer(serializers.ModelSerializer):
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
     image = Base64ImageField(max_length=None)
+    nutrition = NutritionSerializer(source='*', read_only=True)
 
     class Meta:
         model = Recipe
@@ -121,9 +145,32 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'name',
             'image',
             'text',
-            'cooking_time'
+            'cooking_time',
+            'nutrition'
         )
 
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if expand is None:
+            return
+        collapsed = {
+            'author': serializers.PrimaryKeyRelatedField(read_only=True),
+            'ingredients': IngredientAmountSerializer(
+                many=True,
+                source='ingredienttorecipe'
+            ),
+            'tags': serializers.PrimaryKeyRelatedField(
+                many=True,
+                read_only=True
+            ),
+        }
+        for name, field in collapsed.items():
+            if name in self.fields and name not in expand:
+                self.fields[name] = field
+
     def get_ingredients(self, recipe):
         return recipe.ingredients.values(
             'id',
@@ -136,13 +183,17 @@ class RecipeReadSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
+        if hasattr(recipe, 'is_favorited'):
+            return recipe.is_favorited
         return recipe.favorites.filter(user=request.user).exists()
 
     def get_is_in_shopping_cart(self, recipe):
-        user = self.context.get('request').user
-        if user.is_anonymous:
+        request = self.context.get('request')
+        if not request or request.user.is_anonymous:
             return False
-        return user.shopping_cart.filter(recipe=recipe).exists()
+        if hasattr(recipe, 'is_in_shopping_cart'):
+            return recipe.is_in_shopping_cart
+        return request.user.shopping_cart.filter(recipe=recipe).exists()
 
 
 class CreateRecipeSerializer(serializers.ModelSerializer):
@@ -242,42 +293,40 @@ class CreateRecipeSerializer(serializers.ModelSerializer):
         tags = validated_data.pop('tags')
         ingredients = validated_data.pop('ingredients')
 
-        recipe = Recipe.objects.create(**validated_data)
-        recipe.tags.set(tags)
-
-        for ingredient in ingredients:
-            amount = ingredient['amount']
-            ingredient = get_object_or_404(Ingredient, pk=ingredient['id'].id)
-
-            IngredientRecipe.objects.create(
-                recipe=recipe,
-                ingredient=ingredient,
-                amount=amount
-            )
+        with transaction.atomic(), recipe_updates():
+            recipe = Recipe.objects.create(**validated_data)
+            recipe.tags.set(tags)
+            self.set_ingredients(recipe, ingredients)
+        recipe.refresh_from_db(fields=NUTRITION_FIELDS)
 
         return recipe
 
     def update(self, instance, validated_data):
         tags = validated_data.pop('tags', None)
-        if tags is not None:
-            instance.tags.set(tags)
-
         ingredients = validated_data.pop('ingredients', None)
-        if ingredients is not None:
-            instance.ingredients.clear()
+        with transaction.atomic(), recipe_updates():
+            if tags is not None:
+                instance.tags.set(tags)
+            if ingredients is not None:
+                IngredientRecipe.objects.filter(recipe=instance).delete()
+                self.set_ingredients(instance, ingredients)
+            instance = super().update(instance, validated_data)
+        instance.refresh_from_db(fields=NUTRITION_FIELDS)
 
-            for ingredient in ingredients:
-                amount = ingredient['amount']
-                ingredient = get_object_or_404(
-                    Ingredient, pk=ingredient['id'].id
-                )
-                IngredientRecipe.objects.update_or_create(
-                    recipe=instance,
-                    ingredient=ingredient,
-                    defaults={'amount': amount}
-                )
+        return instance
 
-        return super().update(instance, validated_data)
+    @staticmethod
+    def set_ingredients(recipe, ingredients):
+        IngredientRecipe.objects.bulk_create(
+            IngredientRecipe(
+                recipe=recipe,
+                ingredient=ingredient['id'],
+                amount=ingredient['amount']
+            )
+            for ingredient in ingredients
+        )
+        recompute_nutrition([recipe.pk])
+        invalidate_recipes([recipe.pk])
 
     def to_representation(self, recipe):
         return RecipeReadSerializer(recipe, context={
@@ -289,3 +338,11 @@ class RecipeShortSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recipe
         fields = ('id', 'name', 'image', 'cooking_time')
+
+
+class RecipeIdsSerializer(serializers.Serializer):
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=RECIPES_BATCH_LIMIT,
+    )
@@ -0,0 +1,173 @@
+import time
+from contextlib import contextmanager
+from threading import local
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_started
+from django.db import connections, transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag, User
+from recipes.nutrition import update_nutrition
+from recipes.signals import ingredients_updated
+
+from .authentication import get_token_cache_key
+from .recipe_cache import bump_catalog_version, bump_recipe_versions
+
+PROFILE_FIELDS = ('email', 'username', 'first_name', 'last_name')
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    cache.delete(get_token_cache_key(instance.key))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, update_fields,
+                           **kwargs):
+    if created or (
+        update_fields is not None and set(update_fields) <= {'last_login'}
+    ):
+        return
+    cache.delete_many([
+        get_token_cache_key(key)
+        for key in Token.objects.filter(
+            user=instance
+        ).values_list('key', flat=True)
+    ])
+
+
+@receiver(request_started)
+def check_persistent_connections(sender, **kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        checked = getattr(connection, 'health_checked_at', 0)
+        if now - checked < settings.DB_HEALTH_CHECK_INTERVAL:
+            continue
+        connection.health_checked_at = now
+        if not connection.is_usable():
+            connection.close()
+
+
+pending = local()
+
+
+@contextmanager
+def recipe_updates():
+    if getattr(pending, 'updates', None) is not None:
+        yield
+        return
+    pending.updates = {'nutrition': set(), 'touch': set()}
+    try:
+        yield
+        updates = pending.updates
+    finally:
+        pending.updates = None
+    recompute_nutrition(updates['nutrition'])
+    invalidate_recipes(updates['touch'])
+
+
+def recompute_nutrition(recipe_ids):
+    recipe_ids = set(recipe_ids)
+    updates = getattr(pending, 'updates', None)
+    if updates is not None:
+        updates['nutrition'] |= recipe_ids
+    elif recipe_ids:
+        update_nutrition(Recipe.objects.filter(pk__in=recipe_ids))
+
+
+def invalidate_recipes(recipe_ids, touch=True):
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    updates = getattr(pending, 'updates', None)
+    if touch and updates is not None:
+        updates['touch'].update(recipe_ids)
+        return
+    if touch:
+        Recipe.objects.filter(pk__in=recipe_ids).update(
+            updated_at=timezone.now()
+        )
+    transaction.on_commit(lambda: bump_recipe_versions(recipe_ids))
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe(sender, instance, **kwargs):
+    invalidate_recipes([instance.pk], touch=False)
+
+
+@receiver(post_save, sender=IngredientRecipe)
+@receiver(post_delete, sender=IngredientRecipe)
+def invalidate_recipe_ingredients(sender, instance, **kwargs):
+    recompute_nutrition([instance.recipe_id])
+    invalidate_recipes([instance.recipe_id])
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def invalidate_recipe_relations(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_recipes([instance.pk])
+    elif action == 'pre_clear':
+        invalidate_recipes(instance.recipe_set.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_recipes(pk_set)
+
+
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def update_recipe_nutrition(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        recompute_nutrition([instance.pk])
+    elif pk_set:
+        recompute_nutrition(pk_set)
+
+
+@receiver(post_save, sender=Ingredient)
+def update_ingredient_nutrition(sender, instance, created, **kwargs):
+    if not created:
+        update_nutrition(instance.recipe_set.all())
+
+
+@receiver(ingredients_updated)
+def invalidate_updated_ingredients(sender, recipe_ids, **kwargs):
+    invalidate_recipes(recipe_ids)
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(pre_delete, sender=Ingredient)
+def invalidate_catalog(sender, instance, **kwargs):
+    instance.recipe_set.update(updated_at=timezone.now())
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_recipes(sender, instance, created, update_fields,
+                              **kwargs):
+    if created or (
+        update_fields is not None
+        and not set(update_fields) & set(PROFILE_FIELDS)
+    ):
+        return
+    invalidate_recipes(
+        instance.recipes.values_list('pk', flat=True)
+    )
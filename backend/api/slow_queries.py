@@ -0,0 +1,109 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+LITERALS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?)'),
+    (re.compile(r'\s+'), ' '),
+)
+PROJECT_APPS = ('api', 'recipes')
+EXPLAIN_SQL = 'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) '
+
+local = threading.local()
+
+
+def get_fingerprint(sql):
+    for pattern, replacement in LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def get_origin():
+    base_dir = str(settings.BASE_DIR)
+    app_dirs = tuple(f'{base_dir}/{app}/' for app in PROJECT_APPS)
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if frame.filename.startswith(app_dirs) and not frame.filename.endswith(
+            ('slow_queries.py', 'middleware.py')
+        ):
+            return (
+                f'{frame.filename[len(base_dir) + 1:]}:{frame.lineno} '
+                f'{frame.name}'
+            )
+    return None
+
+
+def explain(connection, sql, params):
+    local.explaining = True
+    try:
+        with transaction.atomic(using=connection.alias, savepoint=True):
+            with connection.cursor() as cursor:
+                cursor.execute(EXPLAIN_SQL + sql, params)
+                return cursor.fetchone()[0]
+    except DatabaseError as error:
+        return f'EXPLAIN не выполнен: {error}'
+    finally:
+        local.explaining = False
+
+
+def should_explain(connection, sql):
+    return (
+        connection.vendor == 'postgresql'
+        and sql.lstrip()[:6].upper() == 'SELECT'
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE
+    )
+
+
+def write_entry(entry):
+    with open(settings.SLOW_QUERY_LOG, 'a', encoding='utf-8') as log_file:
+        log_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+class SlowQueryLogger:
+    def __init__(self, view):
+        self.view = view
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(local, 'explaining', False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = execute(sql, params, many, context)
+            failed = False
+            return result
+        finally:
+            duration = time.perf_counter() - started
+            if duration >= settings.SLOW_QUERY_THRESHOLD:
+                self.log(
+                    context['connection'], sql, params,
+                    many or failed, duration
+                )
+
+    def log(self, connection, sql, params, skip_explain, duration):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'duration_ms': round(duration * 1000, 3),
+            'view': self.view,
+            'origin': get_origin(),
+            'fingerprint': get_fingerprint(sql),
+            'sql': sql,
+        }
+        if not skip_explain and should_explain(connection, sql):
+            entry['explain'] = explain(connection, sql, params)
+        logger.warning(
+            f'{entry["duration_ms"]} ms {entry["view"]} {entry["origin"]}: '
+            f'{entry["fingerprint"]}'
+        )
+        write_entry(entry)
@@ -0,0 +1,110 @@
+import base64
+import io
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import override_settings
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from recipes.models import (
+    Favorite,
+    Follow,
+    Ingredient,
+    IngredientRecipe,
+    Recipe,
+    ShoppingCart,
+    Tag,
+    User
+)
+
+AUTHORS = 4
+RECIPES = 12
+INGREDIENTS_PER_RECIPE = 3
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image():
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), '#FF7ECA').save(buffer, 'PNG')
+    return (
+        'data:image/png;base64,'
+        + base64.b64encode(buffer.getvalue()).decode()
+    )
+
+
+def create_user(name):
+    return User.objects.create_user(
+        email=f'{name}@foodgram.test',
+        username=name,
+        first_name=name,
+        last_name=name,
+        password='password',
+    )
+
+
+def get_client(user=None):
+    client = APIClient()
+    if user is not None:
+        token, _ = Token.objects.get_or_create(user=user)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class FoodgramTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.authors = [create_user(f'author{i}') for i in range(AUTHORS)]
+        cls.tags = [
+            Tag.objects.create(
+                name=f'Тег {i}', color=f'#00000{i}', slug=f'tag{i}'
+            )
+            for i in range(2)
+        ]
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'продукт {i}', measurement_unit='г'
+            )
+            for i in range(RECIPES + INGREDIENTS_PER_RECIPE)
+        ]
+        cls.recipes = []
+        for number in range(RECIPES):
+            recipe = Recipe.objects.create(
+                author=cls.authors[number % AUTHORS],
+                name=f'Рецепт {number}',
+                text='Описание',
+                image='recipes/image/test.png',
+                cooking_time=10,
+            )
+            recipe.tags.set(cls.tags)
+            IngredientRecipe.objects.bulk_create(
+                IngredientRecipe(
+                    recipe=recipe,
+                    ingredient=ingredient,
+                    amount=100,
+                )
+                for ingredient in cls.ingredients[
+                    number:number + INGREDIENTS_PER_RECIPE
+                ]
+            )
+            cls.recipes.append(recipe)
+        for recipe in cls.recipes[::2]:
+            Favorite.objects.create(user=cls.user, recipe=recipe)
+            ShoppingCart.objects.create(user=cls.user, recipe=recipe)
+        for author in cls.authors[:2]:
+            Follow.objects.create(user=cls.user, author=author)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.anon = get_client()
+        self.client = get_client(self.user)
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+
+from api.authentication import get_token_cache_key
+from recipes.models import User
+
+from .base import FoodgramTestCase, get_client
+
+
+class CachedTokenAuthenticationTests(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.token = self.user.auth_token.key
+
+    def test_cache_has_no_password(self):
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+        cached = cache.get(get_token_cache_key(self.token))
+        self.assertIsNotNone(cached)
+        self.assertNotIn('password', cached)
+        self.assertNotIn(self.user.password, cached.values())
+        response = self.client.get('/api/users/me/')
+        self.assertEqual(response.json()['username'], self.user.username)
+
+    def test_set_password_with_cached_user(self):
+        self.client.get('/api/users/me/')
+        response = self.client.post('/api/users/set_password/', {
+            'current_password': 'password',
+            'new_password': 'new-Passw0rd-42',
+        }, format='json')
+        self.assertEqual(response.status_code, 204)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.check_password('new-Passw0rd-42'))
+        self.assertEqual(user.email, self.user.email)
+
+    def test_deactivated_user_is_rejected(self):
+        client = get_client(self.authors[0])
+        client.get('/api/users/me/')
+        User.objects.filter(pk=self.authors[0].pk).update(is_active=False)
+        self.authors[0].refresh_from_db()
+        self.authors[0].save()
+        self.assertEqual(client.get('/api/users/me/').status_code, 401)
@@ -0,0 +1,39 @@
+from .base import FoodgramTestCase
+
+
+class FieldsetTests(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recipe = self.recipes[0]
+        self.url = f'/api/recipes/{self.recipe.pk}/'
+
+    def test_head(self):
+        for client in (self.anon, self.client):
+            for url in (
+                '/api/recipes/',
+                '/api/recipes/?fields=name',
+                self.url,
+                f'{self.url}?fields=name&expand=',
+            ):
+                with self.subTest(url=url):
+                    response = client.head(url)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(
+                        response['ETag'], client.get(url)['ETag']
+                    )
+
+    def test_detail_matches_list(self):
+        for query in (
+            '',
+            'fields=name,author,is_favorited',
+            'fields=author,ingredients,tags&expand=tags',
+            'expand=',
+        ):
+            with self.subTest(query=query):
+                listed = self.client.get(
+                    f'/api/recipes/?limit=100&{query}'
+                ).json()['results']
+                detail = self.client.get(f'{self.url}?{query}').json()
+                self.assertIn(detail, listed)
+                cached = self.client.get(f'{self.url}?{query}').json()
+                self.assertEqual(cached, detail)
@@ -0,0 +1,50 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Ingredient
+
+from .base import FoodgramTestCase, get_client, make_image
+
+
+class RecipeNutritionTests(FoodgramTestCase):
+    def test_update_recomputes_once(self):
+        Ingredient.objects.update(calories=100, price=50)
+        recipe = self.recipes[0]
+        data = {
+            'name': 'Новое название',
+            'text': 'Новое описание',
+            'cooking_time': 5,
+            'tags': [self.tags[0].pk],
+            'ingredients': [
+                {'id': ingredient.pk, 'amount': 10}
+                for ingredient in self.ingredients[:10]
+            ],
+        }
+        client = get_client(recipe.author)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.patch(
+                f'/api/recipes/{recipe.pk}/',
+                {**data, 'image': make_image()},
+                format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['nutrition'],
+            {
+                'calories': 100.0,
+                'proteins': 0.0,
+                'fats': 0.0,
+                'carbohydrates': 0.0,
+                'cost': 50.0,
+            }
+        )
+        sql = [query['sql'] for query in queries]
+        for statement in (
+            'UPDATE "recipes_recipe" SET "calories" = CAST(COALESCE',
+            'UPDATE "recipes_recipe" SET "updated_at" =',
+            'DELETE FROM "recipes_ingredientrecipe"',
+        ):
+            with self.subTest(statement=statement):
+                self.assertEqual(
+                    sum(query.startswith(statement) for query in sql), 1
+                )
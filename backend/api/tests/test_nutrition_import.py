@@ -0,0 +1,99 @@
+import io
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+
+from recipes.models import Ingredient, Recipe
+
+from .base import FoodgramTestCase
+
+HEADER = 'name,measurement_unit,calories,proteins,fats,carbohydrates,price\n'
+
+
+class NutritionImportTests(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recipe = self.recipes[0]
+        self.other_recipe = self.recipes[5]
+        self.ingredient = self.recipe.ingredients.order_by('pk').first()
+
+    def import_ingredients(self, rows):
+        data_file = tempfile.NamedTemporaryFile(
+            'w', suffix='.csv', encoding='utf-8', delete=False
+        )
+        with data_file:
+            data_file.write(HEADER + ''.join(rows))
+        self.addCleanup(os.remove, data_file.name)
+        stdout = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                'import_ingredients_data', data_file.name, stdout=stdout
+            )
+        return stdout.getvalue()
+
+    def get_etags(self):
+        return {
+            url: self.anon.get(url)['ETag']
+            for url in (
+                '/api/recipes/',
+                f'/api/recipes/{self.recipe.pk}/',
+                f'/api/recipes/{self.other_recipe.pk}/',
+            )
+        }
+
+    def test_import_invalidates_changed_recipes(self):
+        row = f'{self.ingredient.name},г,250,10,5,30,120\n'
+        etags = self.get_etags()
+        output = self.import_ingredients([row])
+        self.assertIn('пересчитано рецептов: 1.', output)
+        new_etags = self.get_etags()
+        self.assertNotEqual(
+            new_etags['/api/recipes/'], etags['/api/recipes/']
+        )
+        detail_url = f'/api/recipes/{self.recipe.pk}/'
+        self.assertNotEqual(new_etags[detail_url], etags[detail_url])
+        other_url = f'/api/recipes/{self.other_recipe.pk}/'
+        self.assertEqual(new_etags[other_url], etags[other_url])
+        nutrition = self.anon.get(detail_url).json()['nutrition']
+        self.assertEqual(float(nutrition['calories']), 250)
+        self.assertEqual(float(nutrition['cost']), 120)
+        self.assertEqual(
+            Recipe.objects.get(pk=self.other_recipe.pk).calories, 0
+        )
+
+        output = self.import_ingredients([row.replace('250', '250.00')])
+        self.assertNotIn('пересчитано рецептов', output)
+        self.assertEqual(self.get_etags(), new_etags)
+
+    def test_partial_row_keeps_other_values(self):
+        name = self.ingredient.name
+        self.import_ingredients([f'{name},г,250,10,5,30,120\n'])
+        output = self.import_ingredients([f'{name},г,300,,,,\n'])
+        self.assertIn('Пищевая ценность изменена у 1 продуктов', output)
+        ingredient = Ingredient.objects.get(pk=self.ingredient.pk)
+        self.assertEqual(ingredient.calories, 300)
+        self.assertEqual(ingredient.proteins, 10)
+        self.assertEqual(ingredient.price, 120)
+        self.assertEqual(Recipe.objects.get(pk=self.recipe.pk).cost, 120)
+
+    def test_invalid_value_is_reported(self):
+        name = self.ingredient.name
+        with self.assertRaisesMessage(
+            CommandError, f'продукт "{name}", поле calories'
+        ):
+            self.import_ingredients([f'{name},г,много,,,,\n'])
+        self.assertIsNone(
+            Ingredient.objects.get(pk=self.ingredient.pk).calories
+        )
+
+    def test_ingredient_list_is_unchanged(self):
+        response = self.anon.get(f'/api/ingredients/{self.ingredient.pk}/')
+        self.assertEqual(
+            response.json(),
+            {
+                'id': self.ingredient.pk,
+                'name': self.ingredient.name,
+                'measurement_unit': 'г',
+            }
+        )
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.test import override_settings
+
+from api.middleware import QueryBudgetExceeded
+from api.views import RecipeViewSet
+
+from .base import FoodgramTestCase
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(FoodgramTestCase):
+    def assert_within_budget(self, client, method, url, status, data=None):
+        with self.subTest(method=method, url=url):
+            response = getattr(client, method)(url, data, format='json')
+            self.assertEqual(response.status_code, status)
+
+    def test_read_endpoints(self):
+        recipe = self.recipes[0]
+        author = self.authors[0]
+        for client in (self.anon, self.client):
+            for url in (
+                '/api/recipes/',
+                '/api/recipes/?limit=6&page=2',
+                f'/api/recipes/?tags=tag0&tags=tag1&author={author.pk}',
+                f'/api/recipes/{recipe.pk}/',
+                '/api/users/?limit=3',
+                f'/api/users/{author.pk}/',
+            ):
+                self.assert_within_budget(client, 'get', url, 200)
+        for url in (
+            '/api/recipes/?is_favorited=1&is_in_shopping_cart=1',
+            '/api/recipes/download_shopping_cart/',
+            '/api/users/subscriptions/?recipes_limit=2',
+        ):
+            self.assert_within_budget(self.client, 'get', url, 200)
+
+    def test_write_endpoints(self):
+        recipe = self.recipes[1]
+        for action in ('favorite', 'shopping_cart'):
+            url = f'/api/recipes/{recipe.pk}/{action}/'
+            self.assert_within_budget(self.client, 'post', url, 201)
+            self.assert_within_budget(self.client, 'post', url, 400)
+            self.assert_within_budget(self.client, 'delete', url, 204)
+            batch = {'recipes': [recipe.pk for recipe in self.recipes]}
+            url = f'/api/recipes/{action}/'
+            self.assert_within_budget(self.client, 'post', url, 200, batch)
+            self.assert_within_budget(self.client, 'delete', url, 200, batch)
+
+    def test_budget_is_enforced(self):
+        budgets = {**RecipeViewSet.query_budgets, 'list': 1}
+        with mock.patch.object(RecipeViewSet, 'query_budgets', budgets):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/recipes/')
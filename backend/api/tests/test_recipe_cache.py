@@ -0,0 +1,102 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+
+from recipes.models import Ingredient, Tag
+
+from .base import FoodgramTestCase, get_client, make_image
+
+CACHE_DIR = tempfile.mkdtemp()
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': CACHE_DIR,
+}})
+class RecipeCacheTests(FoodgramTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        super().setUp()
+        self.recipe = self.recipes[0]
+        self.url = f'/api/recipes/{self.recipe.pk}/'
+
+    def other_worker(self):
+        return caches.create_connection('default')
+
+    def get(self, worker_cache=None):
+        if worker_cache is None:
+            return self.anon.get(self.url)
+        with mock.patch('api.views.cache', worker_cache), \
+                mock.patch('api.recipe_cache.cache', worker_cache):
+            return self.anon.get(self.url)
+
+    def assert_invalidated(self, write, worker_cache=None):
+        response = self.get(worker_cache)
+        self.assertEqual(self.get(worker_cache)['ETag'], response['ETag'])
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        updated = self.get(worker_cache)
+        self.assertEqual(updated.status_code, 200)
+        self.assertNotEqual(updated['ETag'], response['ETag'])
+        stale = self.anon.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(stale.status_code, 200)
+        return updated.json()
+
+    def test_update_reaches_other_workers(self):
+        author_client = get_client(self.recipe.author)
+
+        def update():
+            response = author_client.patch(self.url, {
+                'name': 'Новое название',
+                'text': 'Новое описание',
+                'cooking_time': 20,
+                'image': make_image(),
+                'tags': [self.tags[0].pk],
+                'ingredients': [
+                    {'id': self.ingredients[-1].pk, 'amount': 50},
+                ],
+            }, format='json')
+            self.assertEqual(response.status_code, 200)
+
+        data = self.assert_invalidated(update, self.other_worker())
+        self.assertEqual(data['name'], 'Новое название')
+        self.assertEqual(data['cooking_time'], 20)
+        self.assertEqual(
+            [tag['id'] for tag in data['tags']], [self.tags[0].pk]
+        )
+        self.assertEqual(
+            [ingredient['amount'] for ingredient in data['ingredients']],
+            [50]
+        )
+
+    def test_ingredient_change(self):
+        ingredient = Ingredient.objects.get(
+            pk=self.recipe.ingredients.first().pk
+        )
+
+        def rename():
+            ingredient.name = 'переименованный продукт'
+            ingredient.save()
+
+        data = self.assert_invalidated(rename, self.other_worker())
+        self.assertIn(
+            'переименованный продукт',
+            [item['name'] for item in data['ingredients']]
+        )
+
+    def test_tag_change(self):
+        tag = Tag.objects.get(pk=self.tags[0].pk)
+
+        def rename():
+            tag.name = 'Новый тег'
+            tag.save()
+
+        data = self.assert_invalidated(rename)
+        self.assertIn('Новый тег', [item['name'] for item in data['tags']])
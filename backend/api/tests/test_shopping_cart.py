@@ -0,0 +1,28 @@
+from .base import FoodgramTestCase, create_user, get_client
+
+URL = '/api/recipes/download_shopping_cart/'
+
+
+class DownloadShoppingCartTests(FoodgramTestCase):
+    def test_download(self):
+        response = self.client.get(URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Content-Type'], 'text/plain; charset=utf-8'
+        )
+        shopping_list = b''.join(response.streaming_content).decode()
+        for recipe in self.recipes[::2]:
+            self.assertIn(recipe.name, shopping_list)
+
+    def test_empty_cart(self):
+        response = get_client(create_user('empty')).get(URL)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.content, b'')
+
+    def test_anonymous(self):
+        response = self.anon.get(URL)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(
+            response.json(),
+            {'detail': 'Учетные данные не были предоставлены.'}
+        )
@@ -0,0 +1,93 @@
+import threading
+from unittest import mock
+
+from django.db import connections
+from rest_framework.test import APITransactionTestCase
+
+from recipes.models import Favorite, Recipe, ShoppingCart
+
+from .base import create_user, get_client
+
+THREADS = 8
+
+
+class ToggleTests(APITransactionTestCase):
+    def setUp(self):
+        self.user = create_user('user')
+        self.recipe = Recipe.objects.create(
+            author=create_user('author'),
+            name='Рецепт',
+            text='Описание',
+            image='recipes/image/test.png',
+            cooking_time=10,
+        )
+        self.client = get_client(self.user)
+
+    def run_in_parallel(self, method, url):
+        barrier = threading.Barrier(THREADS)
+        statuses = []
+
+        def request(client):
+            try:
+                barrier.wait()
+                statuses.append(getattr(client, method)(url).status_code)
+            finally:
+                connections.close_all()
+
+        clients = [get_client(self.user) for _ in range(THREADS)]
+        threads = [
+            threading.Thread(target=request, args=(client,))
+            for client in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(statuses)
+
+    def test_parallel_toggles(self):
+        for action, model in (
+            ('favorite', Favorite),
+            ('shopping_cart', ShoppingCart),
+        ):
+            url = f'/api/recipes/{self.recipe.pk}/{action}/'
+            rows = model.objects.filter(user=self.user, recipe=self.recipe)
+            with self.subTest(action=action, method='post'):
+                self.assertEqual(
+                    self.run_in_parallel('post', url),
+                    [201] + [400] * (THREADS - 1)
+                )
+                self.assertEqual(rows.count(), 1)
+            with self.subTest(action=action, method='delete'):
+                self.assertEqual(
+                    self.run_in_parallel('delete', url),
+                    [204] + [400] * (THREADS - 1)
+                )
+                self.assertEqual(rows.count(), 0)
+
+    def test_recipe_deleted_while_adding(self):
+        create = Favorite.objects.create
+
+        def delete_recipe():
+            try:
+                Recipe.objects.filter(pk=self.recipe.pk).delete()
+            finally:
+                connections.close_all()
+
+        def delete_recipe_and_create(**kwargs):
+            thread = threading.Thread(target=delete_recipe)
+            thread.start()
+            thread.join()
+            return create(**kwargs)
+
+        with mock.patch.object(
+            Favorite.objects, 'create', delete_recipe_and_create
+        ):
+            response = self.client.post(
+                f'/api/recipes/{self.recipe.pk}/favorite/'
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), ['Указанного рецепта не существует!']
+        )
+        self.assertFalse(Favorite.objects.exists())
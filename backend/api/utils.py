@@ -1,5 +1,11 @@
+import io
 from datetime import datetime
 
+from django.http.response import FileResponse
+
+from recipes.models import IngredientRecipe, Recipe
+from recipes.nutrition import NUTRITION_FIELDS
+
 
 def make_shopping_list(ingredients, recipes):
     today = datetime.today()
@@ -14,5 +20,24 @@ def make_shopping_list(ingredients, recipes):
             for i, ingredient in enumerate(ingredients)
         ], '\nСписок рецептов:\n', "\n".join(
             f'- {recipe.name}' for recipe in recipes
+        ), '\nПищевая ценность и стоимость:\n', "\n".join(
+            f'{Recipe._meta.get_field(field).verbose_name}: '
+            f'{sum(getattr(recipe, field) for recipe in recipes)}'
+            for field in NUTRITION_FIELDS
         ),
     ])
+
+
+def shopping_list_response(user):
+    shopping_list = make_shopping_list(
+        IngredientRecipe().get_ingredients_for_user_shopping_cart(user),
+        [
+            item.recipe
+            for item in user.shopping_cart.select_related('recipe')
+        ]
+    )
+    return FileResponse(
+        io.BytesIO(shopping_list.encode()),
+        content_type='text/plain; charset=utf-8',
+        filename=f'{user.username}_shopping_list.txt'
+    )
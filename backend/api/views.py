@@ -1,5 +1,17 @@
 
-from django.http.response import FileResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    Exists,
+    Max,
+    OuterRef,
+    Prefetch,
+    Sum,
+    Value
+)
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet as DjoserUserViewSet
@@ -18,26 +30,35 @@ from rest_framework.status import HTTP_400_BAD_REQUEST
 from recipes.models import (
     Favorite,
     Ingredient,
-    IngredientRecipe,
     Recipe,
     ShoppingCart,
     Tag,
     Follow,
     User
 )
+from recipes.nutrition import NUTRITION_FIELDS
+
+from .conditional import (
+    get_user_state,
+    make_etag,
+    not_modified,
+    set_validators
+)
 from .filters import IngredientFilter, RecipeFilter
 from .pagination import PagePagination
 from .permissions import IsAuthorOrReadOnly
+from .recipe_cache import get_recipe_cache_key
 from .serializers import (
     CreateRecipeSerializer,
     IngredientSerializer,
+    RecipeIdsSerializer,
     RecipeReadSerializer,
     SubscribeListSerializer,
     TagSerializer,
     UserSerializer,
     RecipeShortSerializer
 )
-from .utils import make_shopping_list
+from .utils import shopping_list_response
 
 
 class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
@@ -56,6 +77,44 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
 
 
+def annotate_is_subscribed(users, user):
+    if user.is_anonymous:
+        return users.annotate(is_subscribed=Value(False))
+    return users.annotate(is_subscribed=Exists(
+        Follow.objects.filter(user=user, author=OuterRef('pk'))
+    ))
+
+
+RECIPE_FLAGS = {
+    'is_favorited': Favorite,
+    'is_in_shopping_cart': ShoppingCart,
+}
+
+
+def annotate_recipe_flags(recipes, user, flags=tuple(RECIPE_FLAGS)):
+    if user.is_anonymous:
+        return recipes.annotate(**{flag: Value(False) for flag in flags})
+    return recipes.annotate(**{
+        flag: Exists(RECIPE_FLAGS[flag].objects.filter(
+            user=user, recipe=OuterRef('pk')
+        ))
+        for flag in flags
+    })
+
+
+def get_query_names(request, param, allowed):
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(',')} - {''}
+    unknown = names - set(allowed)
+    if unknown:
+        raise exceptions.ValidationError({
+            param: f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+        })
+    return names
+
+
 class RecipeViewSet(viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     serializer_class = CreateRecipeSerializer
@@ -63,39 +122,221 @@ class RecipeViewSet(viewsets.ModelViewSet):
     pagination_class = PagePagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    query_budgets = {
+        'list': 10,
+        'retrieve': 7,
+        'download_shopping_cart': 4,
+        'shopping_cart_nutrition': 2,
+        'favorite': 6,
+        'shopping_cart': 6,
+        'favorite_batch': 4,
+        'shopping_cart_batch': 4,
+    }
+
+    def with_read_relations(self, recipes, fields=None, expand=None):
+        user = self.request.user
+        fields = set(fields or RecipeReadSerializer.Meta.fields)
+        expand = set(
+            RecipeReadSerializer.expandable_fields if expand is None
+            else expand
+        )
+        lookups = []
+        if 'tags' in fields:
+            lookups.append('tags')
+        if 'ingredients' in fields:
+            lookups.append(
+                'ingredienttorecipe__ingredient' if 'ingredients' in expand
+                else 'ingredienttorecipe'
+            )
+        if 'author' in fields & expand:
+            lookups.append(Prefetch('author', queryset=annotate_is_subscribed(
+                User.objects.all(), user
+            )))
+        if 'text' not in fields:
+            recipes = recipes.defer('text')
+        return annotate_recipe_flags(
+            recipes.prefetch_related(*lookups),
+            user,
+            [flag for flag in RECIPE_FLAGS if flag in fields],
+        )
+
+    def get_fieldset(self):
+        fields = get_query_names(
+            self.request, 'fields', RecipeReadSerializer.Meta.fields
+        )
+        expand = get_query_names(
+            self.request, 'expand', RecipeReadSerializer.expandable_fields
+        )
+        return None if fields is None else fields | {'id'}, expand
+
+    def get_queryset(self):
+        if self.action not in ('list', 'retrieve'):
+            return super().get_queryset()
+        return self.with_read_relations(Recipe.objects.all())
 
     def get_serializer_class(self):
-        if self.request.method == 'GET':
+        if self.request.method in permissions.SAFE_METHODS:
             return RecipeReadSerializer
         return CreateRecipeSerializer
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    def get_user_flags(self, recipe_id):
+        user = self.request.user
+        if user.is_anonymous:
+            return {
+                'is_favorited': False,
+                'is_in_shopping_cart': False,
+                'is_subscribed': False,
+            }
+        flags = annotate_recipe_flags(
+            Recipe.objects.filter(pk=recipe_id), user
+        ).annotate(is_subscribed=Exists(Follow.objects.filter(
+            user=user, author=OuterRef('author')
+        ))).values(
+            'is_favorited', 'is_in_shopping_cart', 'is_subscribed'
+        ).first()
+        if flags is None:
+            raise Http404
+        return flags
+
+    def retrieve(self, request, pk):
+        fields, expand = self.get_fieldset()
+        try:
+            recipe_id = int(pk)
+        except ValueError:
+            raise Http404
+        cache_key = get_recipe_cache_key(recipe_id, fields, expand)
+        cached = cache.get(cache_key)
+        if cached is None:
+            recipe = self.get_object()
+            cached = (
+                RecipeReadSerializer(
+                    recipe, fields=fields, expand=expand
+                ).data,
+                recipe.updated_at,
+            )
+            cache.set(cache_key, cached, settings.RECIPE_CACHE_TIMEOUT)
+            flags = {
+                'is_favorited': recipe.is_favorited,
+                'is_in_shopping_cart': recipe.is_in_shopping_cart,
+                'is_subscribed': recipe.author.is_subscribed,
+            }
+        else:
+            flags = self.get_user_flags(recipe_id)
+        data, updated_at = cached
+        last_modified = updated_at if request.user.is_anonymous else None
+        etag = make_etag(
+            recipe_id,
+            updated_at,
+            sorted(flags.items()),
+            None if fields is None else sorted(fields),
+            None if expand is None else sorted(expand),
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            data = dict(data)
+            if 'image' in data:
+                data['image'] = request.build_absolute_uri(data['image'])
+            for flag in ('is_favorited', 'is_in_shopping_cart'):
+                if flag in data:
+                    data[flag] = flags[flag]
+            if isinstance(data.get('author'), dict):
+                data['author'] = {
+                    **data['author'],
+                    'is_subscribed': flags['is_subscribed'],
+                }
+            response = Response(data)
+        return set_validators(response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        fields, expand = self.get_fieldset()
+        recipes = self.filter_queryset(Recipe.objects.all())
+        state = recipes.aggregate(
+            updated_at=Max('updated_at'),
+            count=Count('pk', distinct=True),
+        )
+        etag = make_etag(
+            request.get_full_path(),
+            state['updated_at'],
+            state['count'],
+            get_user_state(request.user),
+        )
+        response = not_modified(request, etag)
+        if response is None:
+            page = self.paginate_queryset(
+                self.with_read_relations(recipes, fields, expand)
+            )
+            serializer = self.get_serializer(
+                page, many=True, fields=fields, expand=expand
+            )
+            response = self.get_paginated_response(serializer.data)
+        return set_validators(response, etag)
+
     def add_to(self, model, user, pk):
-        if not Recipe.objects.filter(id=pk).exists():
+        recipe = Recipe.objects.filter(id=pk).first()
+        if recipe is None:
             raise exceptions.ValidationError(
                 'Указанного рецепта не существует!'
             )
-        if model.objects.filter(user=user, recipe__id=pk).exists():
-            raise exceptions.ValidationError(
-                'Вы уже добавили этот рецепт'
-            )
-        recipe = get_object_or_404(Recipe, id=pk)
-        model.objects.create(user=user, recipe=recipe)
+        try:
+            with transaction.atomic():
+                model.objects.create(user=user, recipe=recipe)
+        except IntegrityError:
+            if model.objects.filter(user=user, recipe_id=pk).exists():
+                raise exceptions.ValidationError(
+                    'Вы уже добавили этот рецепт'
+                )
+            if not Recipe.objects.filter(id=pk).exists():
+                raise exceptions.ValidationError(
+                    'Указанного рецепта не существует!'
+                )
+            raise
         serializer = RecipeShortSerializer(recipe)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete_from(self, model, user, pk):
-        if not model.objects.filter(
-            user=user.id, recipe=get_object_or_404(Recipe, id=pk)
-        ).exists():
+        deleted, _ = model.objects.filter(user=user, recipe_id=pk).delete()
+        if not deleted:
+            get_object_or_404(Recipe, id=pk)
             raise exceptions.ValidationError(
                 f'Указанного рецепта нет в {model}!'
             )
-        model.objects.filter(user=user, recipe__id=pk).delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def batch_update(self, model, request):
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        recipe_ids = list(dict.fromkeys(serializer.validated_data['recipes']))
+        user = request.user
+        in_list = dict(Recipe.objects.filter(pk__in=recipe_ids).annotate(
+            in_list=Exists(model.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            ))
+        ).values_list('pk', 'in_list'))
+        if request.method == 'POST':
+            model.objects.bulk_create(
+                [
+                    model(user=user, recipe_id=pk)
+                    for pk, present in in_list.items() if not present
+                ],
+                ignore_conflicts=True
+            )
+            statuses = ('added', 'already_added')
+        else:
+            model.objects.filter(user=user, recipe__in=recipe_ids).delete()
+            statuses = ('not_added', 'removed')
+        return Response({'results': [
+            {
+                'id': pk,
+                'status': (
+                    statuses[in_list[pk]] if pk in in_list else 'not_found'
+                ),
+            }
+            for pk in recipe_ids
+        ]})
+
     @action(
         detail=True,
         methods=['POST', 'DELETE'],
@@ -116,6 +357,26 @@ class RecipeViewSet(viewsets.ModelViewSet):
             return self.add_to(ShoppingCart, request.user, pk)
         return self.delete_from(ShoppingCart, request.user, pk)
 
+    @action(
+        detail=False,
+        methods=['POST', 'DELETE'],
+        permission_classes=[IsAuthenticated],
+        url_path='favorite',
+        url_name='favorite-batch'
+    )
+    def favorite_batch(self, request):
+        return self.batch_update(Favorite, request)
+
+    @action(
+        detail=False,
+        methods=['POST', 'DELETE'],
+        permission_classes=[IsAuthenticated],
+        url_path='shopping_cart',
+        url_name='shopping-cart-batch'
+    )
+    def shopping_cart_batch(self, request):
+        return self.batch_update(ShoppingCart, request)
+
     @action(
         detail=False,
         methods=['GET'],
@@ -125,15 +386,21 @@ class RecipeViewSet(viewsets.ModelViewSet):
         user = request.user
         if not user.shopping_cart.exists():
             return Response(status=HTTP_400_BAD_REQUEST)
-        return FileResponse(
-            make_shopping_list(
-                IngredientRecipe().get_ingredients_for_user_shopping_cart(
-                    user
-                ), [
-                    item.recipe for item in user.shopping_cart.all()
-                ]
-            ), content_type='text/plain',
-            filename=f'{user.username}_shopping_list.txt')
+        return shopping_list_response(user)
+
+    @action(
+        detail=False,
+        methods=['GET'],
+        permission_classes=[IsAuthenticated],
+        url_path='shopping_cart/nutrition'
+    )
+    def shopping_cart_nutrition(self, request):
+        totals = Recipe.objects.filter(
+            shopping_cart__user=request.user
+        ).aggregate(**{field: Sum(field) for field in NUTRITION_FIELDS})
+        return Response({
+            field: total or 0 for field, total in totals.items()
+        })
 
 
 class UserViewSet(DjoserUserViewSet):
@@ -141,6 +408,16 @@ class UserViewSet(DjoserUserViewSet):
     serializer_class = UserSerializer
     permission_classes = (AllowAny,)
     pagination_class = PagePagination
+    query_budgets = {
+        'list': 4,
+        'retrieve': 3,
+        'subscriptions': 5,
+    }
+
+    def get_queryset(self):
+        return annotate_is_subscribed(
+            super().get_queryset(), self.request.user
+        )
 
     def get_permissions(self):
         return [
@@ -174,7 +451,15 @@ class UserViewSet(DjoserUserViewSet):
     )
     def subscriptions(self, request):
         user = request.user
-        queryset = User.objects.filter(following__user=user)
+        queryset = User.objects.filter(following__user=user).annotate(
+            recipes_count=Count('recipes'),
+            is_subscribed=Value(True),
+        ).prefetch_related(Prefetch(
+            'recipes',
+            queryset=Recipe.objects.only(
+                'id', 'name', 'image', 'cooking_time', 'author'
+            )
+        )).order_by('username')
         pages = self.paginate_queryset(queryset)
         serializer = SubscribeListSerializer(
             pages, many=True, context={'request': request}
@@ -0,0 +1,429 @@
+import argparse
+import base64
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.test.runner import DiscoverRunner  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment
+)
+from PIL import Image  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from recipes.models import (  # noqa: E402
+    Favorite,
+    Follow,
+    Ingredient,
+    Recipe,
+    ShoppingCart,
+    Tag,
+    User
+)
+
+SEED = 42
+USER_ITEMS = 10
+DEFAULT_THRESHOLD = 0.2
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def check(response, *statuses):
+    if response.status_code not in statuses:
+        raise AssertionError(
+            f'{response.request["PATH_INFO"]}: {response.status_code} '
+            f'{response.content[:200]!r}'
+        )
+    return response
+
+
+def make_image():
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), '#FF7ECA').save(buffer, 'PNG')
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def recipe_payload(ctx, name):
+    return {
+        'ingredients': [
+            {'id': pk, 'amount': 10} for pk in ctx['ingredient_ids'][:5]
+        ],
+        'tags': ctx['tag_ids'][:2],
+        'image': f'data:image/png;base64,{ctx["image"]}',
+        'name': name,
+        'text': 'Описание рецепта для замера.',
+        'cooking_time': 15,
+    }
+
+
+@scenario('ingredients_list')
+def ingredients_list(ctx):
+    check(ctx['anon'].get('/api/ingredients/'), 200)
+
+
+@scenario('ingredients_search')
+def ingredients_search(ctx):
+    check(ctx['anon'].get('/api/ingredients/', {'name': 'сах'}), 200)
+
+
+@scenario('tags_list')
+def tags_list(ctx):
+    check(ctx['anon'].get('/api/tags/'), 200)
+
+
+@scenario('tag_detail')
+def tag_detail(ctx):
+    check(ctx['anon'].get(f'/api/tags/{ctx["tag_ids"][0]}/'), 200)
+
+
+@scenario('recipes_list_anonymous')
+def recipes_list_anonymous(ctx):
+    check(ctx['anon'].get('/api/recipes/'), 200)
+
+
+@scenario('recipes_list')
+def recipes_list(ctx):
+    check(ctx['client'].get('/api/recipes/'), 200)
+
+
+@scenario('recipes_list_limit_24')
+def recipes_list_limit(ctx):
+    check(ctx['client'].get('/api/recipes/', {'limit': 24, 'page': 2}), 200)
+
+
+@scenario('recipes_filter_tag')
+def recipes_filter_tag(ctx):
+    check(ctx['client'].get(
+        '/api/recipes/', {'tags': ctx['tag_slugs'][:1]}
+    ), 200)
+
+
+@scenario('recipes_filter_tags')
+def recipes_filter_tags(ctx):
+    check(ctx['client'].get('/api/recipes/', {'tags': ctx['tag_slugs']}), 200)
+
+
+@scenario('recipes_filter_author')
+def recipes_filter_author(ctx):
+    check(ctx['client'].get(
+        '/api/recipes/', {'author': ctx['author_id']}
+    ), 200)
+
+
+@scenario('recipes_filter_favorited')
+def recipes_filter_favorited(ctx):
+    check(ctx['client'].get('/api/recipes/', {'is_favorited': 1}), 200)
+
+
+@scenario('recipes_filter_shopping_cart')
+def recipes_filter_shopping_cart(ctx):
+    check(ctx['client'].get(
+        '/api/recipes/', {'is_in_shopping_cart': 1}
+    ), 200)
+
+
+@scenario('recipes_filter_combined')
+def recipes_filter_combined(ctx):
+    check(ctx['client'].get('/api/recipes/', {
+        'tags': ctx['tag_slugs'],
+        'author': ctx['author_id'],
+        'is_favorited': 1,
+        'is_in_shopping_cart': 1,
+    }), 200)
+
+
+@scenario('recipe_detail_anonymous')
+def recipe_detail_anonymous(ctx):
+    check(ctx['anon'].get(f'/api/recipes/{ctx["recipe_id"]}/'), 200)
+
+
+@scenario('recipe_detail')
+def recipe_detail(ctx):
+    check(ctx['client'].get(f'/api/recipes/{ctx["recipe_id"]}/'), 200)
+
+
+@scenario('recipe_create')
+def recipe_create(ctx):
+    check(ctx['client'].post(
+        '/api/recipes/', recipe_payload(ctx, 'Замер создания'), format='json'
+    ), 201)
+
+
+@scenario('recipe_update')
+def recipe_update(ctx):
+    check(ctx['client'].patch(
+        f'/api/recipes/{ctx["own_recipe_id"]}/',
+        recipe_payload(ctx, 'Замер обновления'),
+        format='json'
+    ), 200)
+
+
+@scenario('favorite_toggle')
+def favorite_toggle(ctx):
+    url = f'/api/recipes/{ctx["recipe_id"]}/favorite/'
+    check(ctx['client'].post(url), 201)
+    check(ctx['client'].delete(url), 204)
+
+
+@scenario('shopping_cart_toggle')
+def shopping_cart_toggle(ctx):
+    url = f'/api/recipes/{ctx["recipe_id"]}/shopping_cart/'
+    check(ctx['client'].post(url), 201)
+    check(ctx['client'].delete(url), 204)
+
+
+@scenario('download_shopping_cart')
+def download_shopping_cart(ctx):
+    response = check(
+        ctx['client'].get('/api/recipes/download_shopping_cart/'), 200
+    )
+    b''.join(response.streaming_content)
+
+
+@scenario('users_list')
+def users_list(ctx):
+    check(ctx['client'].get('/api/users/'), 200)
+
+
+@scenario('user_detail')
+def user_detail(ctx):
+    check(ctx['client'].get(f'/api/users/{ctx["author_id"]}/'), 200)
+
+
+@scenario('users_me')
+def users_me(ctx):
+    check(ctx['client'].get('/api/users/me/'), 200)
+
+
+@scenario('subscriptions')
+def subscriptions(ctx):
+    check(ctx['client'].get(
+        '/api/users/subscriptions/', {'recipes_limit': 3}
+    ), 200)
+
+
+@scenario('subscribe_toggle')
+def subscribe_toggle(ctx):
+    url = f'/api/users/{ctx["author_id"]}/subscribe/'
+    check(ctx['client'].post(url), 201)
+    check(ctx['client'].delete(url), 204)
+
+
+@scenario('token_login')
+def token_login(ctx):
+    check(ctx['anon'].post('/api/auth/token/login/', {
+        'email': ctx['user'].email, 'password': 'bench-password'
+    }, format='json'), 200)
+
+
+def seed(scale):
+    for command, options in (
+        ('import_ingredients_data', {}),
+        ('import_tags_data', {}),
+        ('generate_fake_data', {'preset': scale, 'seed': SEED}),
+    ):
+        call_command(command, stdout=io.StringIO(), **options)
+    user = User.objects.create_user(
+        username='bench',
+        email='bench@foodgram.ru',
+        password='bench-password',
+        first_name='Бенч',
+        last_name='Марк',
+    )
+    recipe_ids = list(
+        Recipe.objects.order_by('pk').values_list('pk', flat=True)
+    )
+    popular_author = User.objects.exclude(pk=user.pk).annotate(
+        recipes_count=Count('recipes')
+    ).order_by('-recipes_count').first()
+    authors = User.objects.exclude(
+        pk__in=(user.pk, popular_author.pk)
+    ).order_by('pk')[:USER_ITEMS]
+    Favorite.objects.bulk_create(
+        Favorite(user=user, recipe_id=pk) for pk in recipe_ids[1:][:USER_ITEMS]
+    )
+    ShoppingCart.objects.bulk_create(
+        ShoppingCart(user=user, recipe_id=pk)
+        for pk in recipe_ids[1:][:USER_ITEMS]
+    )
+    Follow.objects.bulk_create(
+        Follow(user=user, author=author) for author in authors
+    )
+    own_recipe = Recipe.objects.create(
+        author=user,
+        name='Рецепт для обновления',
+        text='Описание',
+        cooking_time=10,
+        image=Recipe.objects.values_list('image', flat=True).first(),
+    )
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}'
+    )
+    return {
+        'user': user,
+        'client': client,
+        'anon': APIClient(),
+        'image': make_image(),
+        'recipe_id': recipe_ids[0],
+        'own_recipe_id': own_recipe.pk,
+        'author_id': popular_author.pk,
+        'tag_ids': list(Tag.objects.values_list('pk', flat=True)),
+        'tag_slugs': list(Tag.objects.values_list('slug', flat=True)),
+        'ingredient_ids': list(
+            Ingredient.objects.order_by('pk').values_list('pk', flat=True)
+        ),
+        'dataset': {
+            'recipes': len(recipe_ids),
+            'users': User.objects.count(),
+            'favorites': Favorite.objects.count(),
+            'follows': Follow.objects.count(),
+        },
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(func, ctx, iterations, warmup):
+    for _ in range(warmup):
+        func(ctx)
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            func(ctx)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+    return {
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p90_ms': round(percentile(timings, 0.9), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'queries': max(queries),
+    }
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['p50_ms'] > previous['p50_ms'] * (1 + threshold):
+            regressions.append(
+                f'{name}: p50 {previous["p50_ms"]} -> {current["p50_ms"]} ms'
+            )
+        if current['queries'] > previous['queries']:
+            regressions.append(
+                f'{name}: запросов {previous["queries"]} -> '
+                f'{current["queries"]}'
+            )
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Замер задержек и числа SQL-запросов эндпоинтов API.'
+    )
+    parser.add_argument(
+        '--scale', default='small', choices=('small', 'medium', 'large')
+    )
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument(
+        '--only', nargs='*', choices=SCENARIOS, help='Запустить только эти.'
+    )
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument('--compare', help='JSON с результатами для сравнения.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        '--query-budget', default='raise', choices=('off', 'log', 'raise'),
+        help='Проверка бюджетов SQL-запросов представлений.'
+    )
+    return parser.parse_args()
+
+
+def run(args):
+    ctx = seed(args.scale)
+    results = {}
+    for name in args.only or SCENARIOS:
+        results[name] = measure(
+            SCENARIOS[name], ctx, args.iterations, args.warmup
+        )
+        print(
+            f'{name:<30} p50 {results[name]["p50_ms"]:8.2f} ms  '
+            f'p99 {results[name]["p99_ms"]:8.2f} ms  '
+            f'запросов {results[name]["queries"]:4}'
+        )
+    return ctx, results
+
+
+def main():
+    args = parse_args()
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0)
+    old_config = runner.setup_databases()
+    media_root = tempfile.TemporaryDirectory()
+    try:
+        with override_settings(
+            MEDIA_ROOT=media_root.name,
+            QUERY_BUDGET_MODE=args.query_budget,
+        ):
+            ctx, results = run(args)
+    finally:
+        runner.teardown_databases(old_config)
+        media_root.cleanup()
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'scale': args.scale,
+            'iterations': args.iterations,
+            'dataset': ctx['dataset'],
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f'РЕГРЕССИЯ {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
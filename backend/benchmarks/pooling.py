@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+MODES = {
+    'new': {'CONN_MAX_AGE': '0'},
+    'persistent': {'CONN_MAX_AGE': '60'},
+    'pool': {'CONN_MAX_AGE': '0', 'ENGINE': 'foodgram.db.postgresql_pool'},
+}
+URLS = ('/api/tags/', '/api/recipes/')
+
+
+def run_worker(args):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+    django.setup()
+
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    errors = []
+
+    def hammer():
+        client = Client(raise_request_exception=False)
+        for number in range(args.requests):
+            response = client.get(URLS[number % len(URLS)])
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    threads = [threading.Thread(target=hammer) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'vendor': connection.vendor,
+        'requests_per_second': round(
+            args.threads * args.requests / elapsed, 1
+        ),
+        'errors': len(errors),
+    }))
+
+
+def run_modes(args):
+    for mode in args.modes:
+        env = {**os.environ, **MODES[mode]}
+        result = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.pooling',
+                '--worker', '--threads', str(args.threads),
+                '--requests', str(args.requests),
+            ],
+            env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            print(f'{mode:<12} ошибка: {result.stderr.strip()[-500:]}')
+            continue
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        print(
+            f'{mode:<12} {stats["requests_per_second"]:8.1f} запросов/с  '
+            f'ошибок {stats["errors"]}  ({stats["vendor"]})'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Пропускная способность API с новыми, постоянными и '
+            'пулированными соединениями с базой данных.'
+        )
+    )
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument(
+        '--modes', nargs='*', choices=MODES, default=list(MODES)
+    )
+    parser.add_argument('--worker', action='store_true')
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args)
+    else:
+        run_modes(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import json
+import os
+import timeit
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from django.utils.translation import gettext_lazy  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.renderers import ORJSONRenderer  # noqa: E402
+
+REPEAT = 5
+NUMBER = 50
+
+
+def load_ingredients():
+    with open(
+        settings.BASE_DIR / 'data' / 'ingredients.json', encoding='utf-8'
+    ) as data_file_ingredients:
+        return [
+            {'id': pk, **data}
+            for pk, data in enumerate(json.load(data_file_ingredients), 1)
+        ]
+
+
+def make_recipes_page(ingredients, page_size=6, ingredients_count=12):
+    author = {
+        'email': 'author@foodgram.ru',
+        'id': 1,
+        'username': 'author',
+        'first_name': 'Автор',
+        'last_name': 'Рецептов',
+        'is_subscribed': False,
+    }
+    tags = [
+        {'id': 1, 'name': 'Завтрак', 'color': '#FF7ECA', 'slug': 'breakfast'},
+        {'id': 2, 'name': 'Обед', 'color': '#346CFF', 'slug': 'lunch'},
+    ]
+    results = [
+        {
+            'id': pk,
+            'tags': tags,
+            'author': author,
+            'ingredients': [
+                {**ingredient, 'amount': 100}
+                for ingredient in ingredients[
+                    pk * ingredients_count:(pk + 1) * ingredients_count
+                ]
+            ],
+            'is_favorited': False,
+            'is_in_shopping_cart': False,
+            'name': f'Рецепт {pk}',
+            'image': f'http://localhost/media/recipes/image/{pk}.png',
+            'text': 'Описание рецепта. ' * 20,
+            'cooking_time': 30,
+        }
+        for pk in range(page_size)
+    ]
+    return {
+        'count': 1000,
+        'next': 'http://localhost/api/recipes/?page=2',
+        'previous': None,
+        'results': results,
+    }
+
+
+def make_mixed_payload():
+    return {
+        'amount': Decimal('12.50'),
+        'created': timezone.now(),
+        'message': gettext_lazy('Рецепт'),
+    }
+
+
+def check_compatible(payloads):
+    for name, data in payloads.items():
+        expected = JSONRenderer().render(data)
+        actual = ORJSONRenderer().render(data)
+        if json.loads(expected) != json.loads(actual):
+            raise AssertionError(f'{name}: выводы рендереров различаются')
+
+
+def main():
+    ingredients = load_ingredients()
+    payloads = {
+        'ingredients': ingredients,
+        'recipes_page': make_recipes_page(ingredients),
+        'mixed': make_mixed_payload(),
+    }
+    check_compatible(payloads)
+    for name, data in payloads.items():
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            best = min(timeit.repeat(
+                lambda: renderer.render(data), repeat=REPEAT, number=NUMBER
+            )) / NUMBER
+            print(
+                f'{name:<14} {type(renderer).__name__:<16} '
+                f'{best * 1000:8.3f} ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+BODY_SIZE = 2048
+PROBE_PATH = '/api/tags/'
+UPLOAD_PATH = '/api/recipes/'
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n'):
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':', 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def slow_upload(host, port, duration, token):
+    reader, writer = await asyncio.open_connection(host, port)
+    headers = (
+        f'POST {UPLOAD_PATH} HTTP/1.1\r\n'
+        f'Host: {host}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {BODY_SIZE}\r\n'
+        'Connection: close\r\n'
+    )
+    if token:
+        headers += f'Authorization: Token {token}\r\n'
+    writer.write((headers + '\r\n').encode())
+    body = b'{"image": "' + b'A' * (BODY_SIZE - 13) + b'"}'
+    chunk = max(BODY_SIZE // 50, 1)
+    for start in range(0, BODY_SIZE, chunk):
+        writer.write(body[start:start + chunk])
+        await writer.drain()
+        await asyncio.sleep(duration / 50)
+    try:
+        await read_response(reader)
+    finally:
+        writer.close()
+
+
+async def probe(host, port):
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f'GET {PROBE_PATH} HTTP/1.1\r\nHost: {host}\r\n'
+        'Connection: close\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    status = await read_response(reader)
+    writer.close()
+    return status, time.perf_counter() - started
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    uploads = [
+        asyncio.create_task(slow_upload(host, port, args.duration, args.token))
+        for _ in range(args.slow_clients)
+    ]
+    await asyncio.sleep(args.duration / 10)
+    latencies = []
+    failures = 0
+    deadline = time.perf_counter() + args.duration * 0.8
+    while time.perf_counter() < deadline:
+        try:
+            status, latency = await asyncio.wait_for(
+                probe(host, port), timeout=args.duration
+            )
+        except (asyncio.TimeoutError, OSError):
+            failures += 1
+            continue
+        if status != 200:
+            failures += 1
+        latencies.append(latency * 1000)
+        await asyncio.sleep(args.probe_interval)
+    await asyncio.gather(*uploads, return_exceptions=True)
+    if not latencies:
+        print(f'Ни один быстрый запрос не выполнен, ошибок: {failures}')
+        return
+    latencies.sort()
+    print(
+        f'{args.slow_clients} медленных загрузок, '
+        f'{len(latencies)} быстрых запросов: '
+        f'p50 {statistics.median(latencies):.1f} ms, '
+        f'p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms, '
+        f'ошибок {failures}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Задержка быстрых запросов, пока медленные клиенты загружают '
+            'тело запроса. Запускать против gunicorn с синхронными и с '
+            'uvicorn-воркерами при одинаковом числе воркеров.'
+        )
+    )
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--slow-clients', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--probe-interval', type=float, default=0.1)
+    parser.add_argument('--token', help='Токен для медленных запросов.')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter
+
+MODES = {
+    'full': {'API_ONLY': 'False'},
+    'api': {'API_ONLY': 'True'},
+}
+
+
+def run_worker(args):
+    from wsgiref.util import setup_testing_defaults
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+
+    from foodgram.wsgi import application
+
+    environ = {'PATH_INFO': args.path}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = application(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    b''.join(body)
+    body.close()
+    print(json.dumps({
+        'status': statuses[0],
+        'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+
+
+def parse_importtime(stderr):
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, _, name = line[len('import time:'):].split('|')
+        packages[name.strip().split('.')[0]] += int(self_time)
+    return packages
+
+
+def run_mode(mode, args):
+    env = {**os.environ, **MODES[mode]}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [
+            sys.executable, '-X', 'importtime', '-m', 'benchmarks.startup',
+            '--worker', '--path', args.path,
+        ],
+        env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip()[-500:])
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    return elapsed, stats, parse_importtime(result.stderr)
+
+
+def run_modes(args):
+    for mode in args.modes:
+        timings = []
+        for _ in range(args.runs):
+            elapsed, stats, packages = run_mode(mode, args)
+            timings.append(elapsed)
+        print(
+            f'{mode:<6} первый запрос через {min(timings) * 1000:7.1f} ms  '
+            f'RSS {stats["rss_kb"] / 1024:6.1f} MiB  '
+            f'импорт {sum(packages.values()) / 1000:7.1f} ms  '
+            f'({stats["status"]})'
+        )
+        for name, self_time in packages.most_common(args.top):
+            print(f'        {self_time / 1000:7.1f} ms  {name}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Время до первого ответа, RSS процесса и время импорта пакетов '
+            'для полного и API-only режима.'
+        )
+    )
+    parser.add_argument('--path', default='/api/tags/')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument(
+        '--modes', nargs='*', choices=MODES, default=list(MODES)
+    )
+    parser.add_argument('--worker', action='store_true')
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args)
+    else:
+        run_modes(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+PATHS = ('/api/recipes/', '/api/tags/', '/api/ingredients/?name=%D0%BC')
+
+
+def hammer(url, paths, headers, deadline, results):
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+    latencies = []
+    statuses = Counter()
+    cache = Counter()
+    sent = 0
+    number = 0
+    while time.perf_counter() < deadline:
+        path = paths[number % len(paths)]
+        number += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            statuses['error'] += 1
+            connection.close()
+            connection = http.client.HTTPConnection(
+                url.hostname, url.port or 80
+            )
+            continue
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status] += 1
+        cache[response.getheader('X-Cache-Status', '-')] += 1
+        sent += len(body)
+    connection.close()
+    results.append((latencies, statuses, cache, sent))
+
+
+def run(args):
+    url = urlsplit(args.url)
+    headers = {'Host': url.netloc}
+    if args.encoding:
+        headers['Accept-Encoding'] = args.encoding
+    if args.token:
+        headers['Authorization'] = f'Token {args.token}'
+    results = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(
+            target=hammer,
+            args=(url, args.paths, headers, deadline, results),
+        )
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies = sorted(
+        latency * 1000 for result in results for latency in result[0]
+    )
+    statuses = sum((result[1] for result in results), Counter())
+    cache = sum((result[2] for result in results), Counter())
+    sent = sum(result[3] for result in results)
+    if not latencies:
+        print(f'Ни один запрос не выполнен: {dict(statuses)}')
+        return
+    print(
+        f'{len(latencies) / args.duration:8.1f} запросов/с  '
+        f'p50 {statistics.median(latencies):.1f} ms  '
+        f'p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms  '
+        f'{sent / len(latencies):.0f} байт/ответ'
+    )
+    print(f'статусы: {dict(statuses)}  кеш: {dict(cache)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Пропускная способность GET-запросов к API. Запускать против '
+            'gateway и напрямую против backend, с сжатием и без.'
+        )
+    )
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--paths', nargs='*', default=list(PATHS))
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument(
+        '--encoding', default='gzip, br',
+        help='Значение Accept-Encoding; пустая строка отключает сжатие.'
+    )
+    parser.add_argument('--token', help='Токен авторизованного клиента.')
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
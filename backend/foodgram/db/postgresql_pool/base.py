@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+import psycopg2.extensions
+import psycopg2.extras
+import psycopg2.pool
+from django.conf import settings
+from django.db.backends.postgresql import base
+
+POOLS = {}
+POOLS_LOCK = threading.Lock()
+
+
+class BlockingConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+
+    def __init__(self, minconn, maxconn, *args, timeout, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._lock = threading.Condition(self._lock)
+
+    def getconn(self, key=None):
+        deadline = time.monotonic() + self.timeout
+        with self._lock:
+            while (
+                not self.closed and not self._pool
+                and len(self._used) >= self.maxconn
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise psycopg2.pool.PoolError(
+                        f'Нет свободных соединений в пуле за {self.timeout} с'
+                    )
+                self._lock.wait(remaining)
+            return self._getconn(key)
+
+    def putconn(self, conn=None, key=None, close=False):
+        with self._lock:
+            self._putconn(conn, key, close)
+            self._lock.notify()
+
+
+def get_pool(alias, conn_params):
+    key = (alias, os.getpid())
+    if key not in POOLS:
+        with POOLS_LOCK:
+            if key not in POOLS:
+                POOLS[key] = BlockingConnectionPool(
+                    settings.DB_POOL_MIN_SIZE,
+                    settings.DB_POOL_MAX_SIZE,
+                    timeout=settings.DB_POOL_TIMEOUT,
+                    **conn_params
+                )
+    return POOLS[key]
+
+
+def close_pools():
+    with POOLS_LOCK:
+        for pool in POOLS.values():
+            pool.closeall()
+        POOLS.clear()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, conn_params)
+        connection = pool.getconn()
+        if connection.closed:
+            pool.putconn(connection, close=True)
+            connection = pool.getconn()
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias, self.get_connection_params())
+        with self.wrap_database_errors:
+            if self.connection.closed:
+                pool.putconn(self.connection, close=True)
+                return
+            if (
+                self.connection.get_transaction_status()
+                != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            ):
+                self.connection.rollback()
+            pool.putconn(self.connection)
@@ -1,6 +1,6 @@
 import os
-
 from pathlib import Path
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,6 +32,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.HealthCheckMiddleware',
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.ProfilingMiddleware',
+    'api.middleware.SlowQueryMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -39,8 +44,31 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.QueryBudgetMiddleware',
 ]
 
+API_ONLY = os.getenv('API_ONLY', default='False') == 'True'
+ADMIN_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'drf_yasg',
+)
+ADMIN_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+)
+
+if API_ONLY:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_APPS]
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware not in ADMIN_MIDDLEWARE
+    ]
+
 ROOT_URLCONF = 'foodgram.urls'
 
 TEMPLATES = [
@@ -60,12 +88,14 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'foodgram.wsgi.application'
+ASGI_APPLICATION = 'foodgram.asgi.application'
 
 if DEBUG:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 else:
@@ -76,10 +106,62 @@ else:
             'USER': os.getenv('POSTGRES_USER', 'foodgram_user'),
             'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
             'HOST': os.getenv('DB_HOST', ''),
-            'DB_PORT': os.getenv('DB_PORT', '5432'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', default=60)),
+            'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+                'DISABLE_SERVER_SIDE_CURSORS', default='False'
+            ) == 'True',
         }
     }
 
+DB_HEALTH_CHECK_INTERVAL = float(os.getenv('DB_HEALTH_CHECK_INTERVAL', default=30))
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', default=1))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', default=10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', default=5))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    }
+}
+
+if CACHES['default']['BACKEND'].endswith('LocMemCache'):
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', default=10000)),
+    }
+
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', default=60))
+RECIPE_CACHE_TIMEOUT = int(os.getenv('RECIPE_CACHE_TIMEOUT', default=60))
+
+HEALTH_LIVE_PATH = '/health/live/'
+HEALTH_READY_PATH = '/health/ready/'
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', default='True') == 'True'
+METRICS_VIEW_NAME = 'metrics'
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', default='False') == 'True'
+PROFILING_THRESHOLD = float(os.getenv('PROFILING_THRESHOLD', default=1.0))
+PROFILING_INTERVAL = float(os.getenv('PROFILING_INTERVAL', default=0.005))
+PROFILING_MAX_PER_MINUTE = int(os.getenv('PROFILING_MAX_PER_MINUTE', default=6))
+PROFILING_DIR = os.getenv('PROFILING_DIR', default=BASE_DIR / 'profiles')
+PROFILING_HEADER = 'HTTP_X_PROFILE'
+
+SLOW_QUERY_ENABLED = os.getenv('SLOW_QUERY_ENABLED', default='True') == 'True'
+SLOW_QUERY_THRESHOLD = float(os.getenv('SLOW_QUERY_THRESHOLD', default=0.2))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_RATE', default=0))
+SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', default=BASE_DIR / 'slow_queries.log')
+
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', default='False') == 'True'
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', default=1024))
+
+QUERY_BUDGET_MODE = os.getenv(
+    'QUERY_BUDGET_MODE', default='log' if DEBUG else 'off'
+)
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,10 +183,24 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "api.authentication.CachedTokenAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
 
+if API_ONLY:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'api.renderers.ORJSONRenderer',
+    ]
+
 DJOSER = {
     "SERIALIZERS": {
         "user_create": "djoser.serializers.UserCreateSerializer",
@@ -136,7 +232,13 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
 
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+    )
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 MIN_COOKING_TIME = 1
+RECIPES_BATCH_LIMIT = 100
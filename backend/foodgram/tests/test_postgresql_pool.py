@@ -0,0 +1,65 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+from psycopg2.pool import PoolError
+
+from foodgram.db.postgresql_pool.base import BlockingConnectionPool
+
+
+class FakeConnectionPool(BlockingConnectionPool):
+    def _connect(self, key=None):
+        connection = mock.MagicMock(closed=False)
+        if key is None:
+            self._pool.append(connection)
+        else:
+            self._used[key] = connection
+            self._rused[id(connection)] = key
+        return connection
+
+
+class BlockingConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = FakeConnectionPool(2, 2, timeout=0.2)
+        self.connections = [self.pool.getconn(), self.pool.getconn()]
+
+    def test_exhausted_pool_times_out(self):
+        started = time.monotonic()
+        with self.assertRaises(PoolError):
+            self.pool.getconn()
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+    def test_waits_for_returned_connection(self):
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(self.pool.getconn())
+        )
+        thread.start()
+        time.sleep(0.05)
+        self.assertEqual(result, [])
+        self.pool.putconn(self.connections[0])
+        thread.join()
+        self.assertEqual(result, [self.connections[0]])
+
+    def test_burst_beyond_maxconn(self):
+        self.pool.timeout = 5
+        for connection in self.connections:
+            self.pool.putconn(connection)
+        errors = []
+
+        def request():
+            try:
+                connection = self.pool.getconn()
+                time.sleep(0.01)
+                self.pool.putconn(connection)
+            except PoolError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=request) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(self.pool._pool), 2)
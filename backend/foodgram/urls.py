@@ -1,13 +1,32 @@
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib import admin
 from django.urls import include, path
 
+from api.metrics import metrics_view
+
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api/', include('api.urls'))
+    path('api/', include('api.urls')),
+    path('metrics/', metrics_view, name=settings.METRICS_VIEW_NAME),
 ]
 
+if not settings.API_ONLY:
+    from django.contrib import admin
+    from drf_yasg import openapi
+    from drf_yasg.views import get_schema_view
+
+    schema_view = get_schema_view(
+        openapi.Info(title='Foodgram API', default_version='v1'),
+        public=True,
+    )
+    urlpatterns = [
+        path('admin/', admin.site.urls),
+        path(
+            'api/docs/',
+            schema_view.with_ui('redoc', cache_timeout=0),
+            name='api-docs'
+        ),
+    ] + urlpatterns
+
 if settings.DEBUG:
     urlpatterns += static(
         settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
@@ -0,0 +1,26 @@
+import gc
+import sys
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.urls import get_resolver
+
+POOL_MODULE = 'foodgram.db.postgresql_pool.base'
+
+
+def close_connections():
+    connections.close_all()
+    if POOL_MODULE in sys.modules:
+        sys.modules[POOL_MODULE].close_pools()
+
+
+def warm_up():
+    get_resolver().reverse_dict
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+    ContentType.objects.get_for_models(*models)
+    close_connections()
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,47 @@
+import os
+import shutil
+
+CPU_COUNT = len(os.sched_getaffinity(0))
+
+bind = os.getenv('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', default=CPU_COUNT * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', default=1))
+preload_app = os.getenv('GUNICORN_PRELOAD', default='True') == 'True'
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', default=1000))
+max_requests_jitter = int(
+    os.getenv('GUNICORN_MAX_REQUESTS_JITTER', default=max_requests // 10)
+)
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', default=30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', default=5))
+worker_tmp_dir = os.getenv('GUNICORN_WORKER_TMP_DIR', default='/dev/shm')
+
+
+def on_starting(server):
+    directory = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def when_ready(server):
+    import django
+    from django.core.management import call_command
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+    django.setup()
+    call_command('check', deploy=True, fail_level='ERROR')
+    if not server.cfg.preload_app:
+        return
+
+    from foodgram.warmup import warm_up
+
+    warm_up()
+    server.log.info('Приложение прогрето перед запуском воркеров')
+
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,11 +1,23 @@
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group
-from django.utils.safestring import mark_safe
+from django.core.cache import cache
+from django.db.models import (
+    Count,
+    Exists,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Subquery
+)
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 
 from .models import (
     Favorite,
+    Follow,
     Ingredient,
     IngredientRecipe,
     Recipe,
@@ -15,13 +27,70 @@ from .models import (
 )
 
 
+TOP_AUTHORS_CACHE_KEY = 'admin:top_author_ids'
+TOP_AUTHORS_CACHE_TIMEOUT = 300
+TOP_AUTHORS_LIMIT = 100
+
 admin.site.unregister(Group)
 
 
+def count_related(model, field):
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef('pk')}).order_by().values(
+            field
+        ).annotate(count=Count('pk')).values('count'),
+        output_field=IntegerField()
+    ), 0)
+
+
+class InputFilter(admin.SimpleListFilter):
+    template = 'admin/input_filter.html'
+    lookup = None
+
+    def lookups(self, request, model_admin):
+        return ((None, None),)
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return None
+        try:
+            return queryset.filter(**{self.lookup: self.value().strip()})
+        except ValueError as error:
+            raise IncorrectLookupParameters(error)
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        all_choice['query_parts'] = (
+            (key, value)
+            for key, value in changelist.get_filters_params().items()
+            if key != self.parameter_name
+        )
+        yield all_choice
+
+
+class UserInputFilter(InputFilter):
+    title = 'имени пользователя'
+    parameter_name = 'username'
+    lookup = 'user__username'
+
+
+class AuthorInputFilter(InputFilter):
+    title = 'автору'
+    parameter_name = 'author'
+    lookup = 'author__username'
+
+
+class RecipeInputFilter(InputFilter):
+    title = 'id рецепта'
+    parameter_name = 'recipe_id'
+    lookup = 'recipe_id'
+
+
 class IngredientInline(admin.TabularInline):
     model = IngredientRecipe
     extra = 3
     min_num = 1
+    autocomplete_fields = ('ingredient', )
 
 
 @admin.register(Recipe)
@@ -37,16 +106,30 @@ class RecipeAdmin(admin.ModelAdmin):
     )
     search_fields = (
         'name',
-        'author',
-        'tags'
+        'author__username',
+        'tags__name'
     )
-    list_filter = ('author', 'tags')
+    list_filter = (AuthorInputFilter, 'tags')
+    list_select_related = ('author', )
+    autocomplete_fields = ('author', )
     inlines = (IngredientInline, )
     empty_value_display = 'Пусто'
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            favorites_count=count_related(Favorite, 'recipe')
+        ).prefetch_related(
+            'tags',
+            Prefetch(
+                'ingredienttorecipe',
+                queryset=IngredientRecipe.objects.select_related('ingredient')
+            )
+        )
 
-    @admin.display(description='Избранное')
+    @admin.display(description='Избранное', ordering='favorites_count')
     def get_favorites(self, recipe):
-        return recipe.favorites.count()
+        return recipe.favorites_count
 
     @admin.display(description='Продукты')
     def get_ingredients(self, recipe):
@@ -73,7 +156,8 @@ class RecipeAdmin(admin.ModelAdmin):
 @admin.register(Ingredient)
 class IngredientAdmin(admin.ModelAdmin):
     list_display = ('name', 'measurement_unit')
-    search_fields = ('name', 'measurement_unit')
+    search_fields = ('^name', )
+    ordering = ('name', )
     list_filter = ('measurement_unit', )
     empty_value_display = 'Пусто'
 
@@ -97,17 +181,39 @@ class TagAdmin(admin.ModelAdmin):
 @admin.register(Favorite)
 class FavoriteAdmin(admin.ModelAdmin):
     list_display = ('user', 'recipe')
-    list_filter = ('user', 'recipe')
-    search_fields = ('user', 'recipe')
+    list_filter = (UserInputFilter, RecipeInputFilter)
+    search_fields = ('user__username', 'recipe__name')
+    list_select_related = ('user', 'recipe')
+    raw_id_fields = ('user', 'recipe')
     empty_value_display = 'Пусто'
+    show_full_result_count = False
 
 
 @admin.register(ShoppingCart)
 class ShoppingCartAdmin(admin.ModelAdmin):
     list_display = ('recipe', 'user')
-    list_filter = ('recipe', 'user')
-    search_fields = ('user', )
+    list_filter = (RecipeInputFilter, UserInputFilter)
+    search_fields = ('user__username', )
+    list_select_related = ('recipe', 'user')
+    raw_id_fields = ('recipe', 'user')
     empty_value_display = 'Пусто'
+    show_full_result_count = False
+
+
+def get_top_author_ids():
+    author_ids = cache.get(TOP_AUTHORS_CACHE_KEY)
+    if author_ids is None:
+        author_ids = list(
+            Follow.objects.values('author').annotate(
+                followers_count=Count('pk')
+            ).order_by('-followers_count').values_list(
+                'author', flat=True
+            )[:TOP_AUTHORS_LIMIT]
+        )
+        cache.set(
+            TOP_AUTHORS_CACHE_KEY, author_ids, TOP_AUTHORS_CACHE_TIMEOUT
+        )
+    return author_ids
 
 
 class SubscriptionsFollowersFilter(admin.SimpleListFilter):
@@ -118,14 +224,22 @@ class SubscriptionsFollowersFilter(admin.SimpleListFilter):
         return (
             ('has_subscriptions', 'Есть подписки'),
             ('has_followers', 'Есть подписчики'),
+            ('top_authors', f'Топ-{TOP_AUTHORS_LIMIT} по подписчикам'),
         )
 
     def queryset(self, request, users):
         value = self.value()
         if value == 'has_subscriptions':
-            return users.filter(following__isnull=False).exists()
+            return users.filter(
+                Exists(Follow.objects.filter(user=OuterRef('pk')))
+            )
         if value == 'has_followers':
-            return users.filter(follower__isnull=False).exists()
+            return users.filter(
+                Exists(Follow.objects.filter(author=OuterRef('pk')))
+            )
+        if value == 'top_authors':
+            return users.filter(pk__in=get_top_author_ids())
+        return None
 
 
 @admin.register(User)
@@ -139,19 +253,27 @@ class UserAdmin(UserAdmin):
         'get_followers_count',
         'get_recipes_count',
     )
-    search_fields = ('username', 'email', )
+    search_fields = ('^username', '^email', )
     list_filter = (SubscriptionsFollowersFilter,)
     ordering = ('username', )
     empty_value_display = 'Пусто'
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            subscriptions_count=count_related(Follow, 'user'),
+            followers_count=count_related(Follow, 'author'),
+            recipes_count=count_related(Recipe, 'author'),
+        )
 
-    @admin.display(description='Подписки')
+    @admin.display(description='Подписки', ordering='subscriptions_count')
     def get_subscriptions_count(self, user):
-        return user.following.count()
+        return user.subscriptions_count
 
-    @admin.display(description='Подписчики')
+    @admin.display(description='Подписчики', ordering='followers_count')
     def get_followers_count(self, user):
-        return user.follower.count()
+        return user.followers_count
 
-    @admin.display(description='Рецепты')
+    @admin.display(description='Рецепты', ordering='recipes_count')
     def get_recipes_count(self, user):
-        return user.recipes.count()
+        return user.recipes_count
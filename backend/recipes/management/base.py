@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from .readers import FORMATS, batched, detect_format, iter_rows
+
+BATCH_SIZE = 1000
+
+
+class BaseImportCommand(BaseCommand):
+    model = None
+    fields = ()
+    default_path = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default=self.default_path,
+            help='Путь к файлу с данными (json, ndjson или csv).'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Формат файла; по умолчанию определяется по расширению.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество записей в одной транзакции.'
+        )
+        parser.add_argument('--encoding', default='utf-8')
+
+    def get_object(self, row):
+        return self.model(**{
+            field: row[field] for field in self.fields
+            if row.get(field) not in (None, '')
+        })
+
+    def save_batch(self, objects):
+        self.model.objects.bulk_create(objects, ignore_conflicts=True)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        data_format = options['format'] or detect_format(path)
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть больше 0.')
+        total_before = self.model.objects.count()
+        processed = 0
+        started = time.monotonic()
+        try:
+            with open(path, encoding=options['encoding']) as data_file:
+                rows = iter_rows(data_file, data_format, self.fields)
+                for batch in batched(rows, batch_size):
+                    with transaction.atomic():
+                        self.save_batch(
+                            [self.get_object(row) for row in batch]
+                        )
+                    processed += len(batch)
+                    self.report(processed, started)
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(
+                f'Ошибка загрузки {path} после {processed} записей: {error}'
+            )
+        created = self.model.objects.count() - total_before
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано {processed} записей, добавлено {created}, '
+            f'пропущено {processed - created} '
+            f'за {time.monotonic() - started:.1f} с.'
+        ))
+
+    def report(self, processed, started):
+        elapsed = time.monotonic() - started
+        rate = processed / elapsed if elapsed else 0
+        self.stdout.write(
+            f'Обработано {processed} записей ({rate:.0f} записей/с)'
+        )
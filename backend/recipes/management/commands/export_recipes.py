@@ -0,0 +1,131 @@
+import json
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.management.base import BATCH_SIZE
+from recipes.models import Recipe
+
+IMAGE_WORKERS = 8
+
+
+def copy_image(name, source_dir, target_dir):
+    source = Path(source_dir) / name
+    target = Path(target_dir) / name
+    if target.exists():
+        return False
+    if not source.exists():
+        raise FileNotFoundError(f'нет файла {source}')
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, target)
+    return True
+
+
+def wait_for_images(images):
+    copied = 0
+    failed = []
+    for name, future in images:
+        try:
+            copied += future.result()
+        except OSError as error:
+            failed.append(f'{name}: {error}')
+    return copied, failed
+
+
+def serialize_recipe(recipe):
+    return {
+        'author': recipe.author.email,
+        'name': recipe.name,
+        'text': recipe.text,
+        'cooking_time': recipe.cooking_time,
+        'pub_date': recipe.pub_date.isoformat(),
+        'image': recipe.image.name,
+        'tags': [tag.slug for tag in recipe.tags.all()],
+        'ingredients': [
+            {
+                'name': item.ingredient.name,
+                'measurement_unit': item.ingredient.measurement_unit,
+                'amount': item.amount,
+            }
+            for item in recipe.ingredienttorecipe.all()
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Выгрузка рецептов в ndjson файл.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            help='Путь к ndjson файлу; по умолчанию вывод в stdout.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--media-dir',
+            help='Каталог, в который копируются изображения рецептов.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=IMAGE_WORKERS,
+            help='Количество потоков для копирования изображений.'
+        )
+
+    def handle(self, *args, **options):
+        output = (
+            open(options['path'], 'w', encoding='utf-8')
+            if options['path'] else sys.stdout
+        )
+        images = []
+        try:
+            exported = self.export(output, options, images)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        self.stderr.write(self.style.SUCCESS(
+            f'Выгружено {exported} рецептов.'
+        ))
+        if options['media_dir']:
+            self.report_images(images)
+
+    def report_images(self, images):
+        copied, failed = wait_for_images(images)
+        for error in failed:
+            self.stderr.write(f'Изображение не скопировано: {error}')
+        style = self.style.ERROR if failed else self.style.SUCCESS
+        self.stderr.write(style(
+            f'Скопировано {copied} изображений, ошибок {len(failed)}.'
+        ))
+
+    def export(self, output, options, images):
+        queryset = Recipe.objects.select_related('author').prefetch_related(
+            'tags', 'ingredienttorecipe__ingredient'
+        ).order_by('pk')
+        media_dir = options['media_dir']
+        exported = 0
+        last_pk = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                recipes = list(
+                    queryset.filter(pk__gt=last_pk)[:options['batch_size']]
+                )
+                if not recipes:
+                    return exported
+                for recipe in recipes:
+                    output.write(json.dumps(
+                        serialize_recipe(recipe), ensure_ascii=False
+                    ) + '\n')
+                if media_dir:
+                    images.extend(
+                        (recipe.image.name, executor.submit(
+                            copy_image, recipe.image.name,
+                            settings.MEDIA_ROOT, media_dir
+                        ))
+                        for recipe in recipes
+                    )
+                exported += len(recipes)
+                last_pk = recipes[-1].pk
@@ -0,0 +1,291 @@
+import multiprocessing
+import random
+import time
+from itertools import accumulate
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+
+from recipes.management.base import BATCH_SIZE
+from recipes.models import (
+    Favorite,
+    Follow,
+    Ingredient,
+    IngredientRecipe,
+    Recipe,
+    ShoppingCart,
+    Tag,
+    User
+)
+from recipes.nutrition import update_nutrition
+
+PRESETS = {
+    'small': {
+        'users': 100,
+        'recipes': 500,
+        'favorites': 2_000,
+        'carts': 500,
+        'follows': 500,
+    },
+    'medium': {
+        'users': 5_000,
+        'recipes': 50_000,
+        'favorites': 100_000,
+        'carts': 20_000,
+        'follows': 20_000,
+    },
+    'large': {
+        'users': 100_000,
+        'recipes': 200_000,
+        'favorites': 1_000_000,
+        'carts': 200_000,
+        'follows': 500_000,
+    },
+}
+USERNAME_PREFIX = 'fake_'
+PASSWORD = 'foodgram-fake'
+PARETO_ALPHA = 1.2
+INGREDIENTS_PER_RECIPE = (3, 10)
+TAGS_PER_RECIPE = (1, 3)
+
+STATE = {}
+
+
+def power_law_cum_weights(rng, count):
+    return list(accumulate(rng.paretovariate(PARETO_ALPHA)
+                           for _ in range(count)))
+
+
+def chunk_rng(kind, index):
+    return random.Random(f'{STATE["seed"]}:{kind}:{index}')
+
+
+def chunk_range(index, total):
+    batch_size = STATE['batch_size']
+    return range(index * batch_size, min((index + 1) * batch_size, total))
+
+
+def generate_recipes(index):
+    rng = chunk_rng('recipes', index)
+    recipes = []
+    ingredients = []
+    tags = []
+    for number in chunk_range(index, STATE['recipes']):
+        pk = STATE['first_recipe_id'] + number
+        products = rng.sample(
+            STATE['ingredients'],
+            min(rng.randint(*INGREDIENTS_PER_RECIPE),
+                len(STATE['ingredients']))
+        )
+        recipes.append(Recipe(
+            pk=pk,
+            author_id=rng.choices(
+                STATE['users'], cum_weights=STATE['author_weights']
+            )[0],
+            name=f'Рецепт {pk}',
+            text='\n'.join(
+                f'Добавить {name}.' for _, name in products
+            ),
+            image=rng.choice(STATE['images']),
+            cooking_time=rng.randint(5, 180),
+        ))
+        ingredients.extend(
+            IngredientRecipe(
+                recipe_id=pk,
+                ingredient_id=ingredient_id,
+                amount=rng.randint(1, 500),
+            )
+            for ingredient_id, _ in products
+        )
+        tags.extend(
+            Recipe.tags.through(recipe_id=pk, tag_id=tag_id)
+            for tag_id in rng.sample(
+                STATE['tags'],
+                min(rng.randint(*TAGS_PER_RECIPE), len(STATE['tags']))
+            )
+        )
+    with transaction.atomic():
+        Recipe.objects.bulk_create(recipes)
+        IngredientRecipe.objects.bulk_create(ingredients)
+        Recipe.tags.through.objects.bulk_create(tags)
+        update_nutrition(Recipe.objects.filter(
+            pk__in=[recipe.pk for recipe in recipes]
+        ))
+    return len(recipes)
+
+
+def generate_user_recipe_pairs(model, kind, index):
+    rng = chunk_rng(kind, index)
+    recipe_ids = STATE['recipe_ids']
+    objs = [
+        model(
+            user_id=rng.choice(STATE['users']),
+            recipe_id=rng.choices(
+                recipe_ids, cum_weights=STATE['recipe_weights']
+            )[0],
+        )
+        for _ in chunk_range(index, STATE[kind])
+    ]
+    model.objects.bulk_create(objs, ignore_conflicts=True)
+    return len(objs)
+
+
+def generate_follows(index):
+    rng = chunk_rng('follows', index)
+    follows = []
+    for _ in chunk_range(index, STATE['follows']):
+        user_id = rng.choice(STATE['users'])
+        author_id = rng.choices(
+            STATE['users'], cum_weights=STATE['author_weights']
+        )[0]
+        if user_id != author_id:
+            follows.append(Follow(user_id=user_id, author_id=author_id))
+    Follow.objects.bulk_create(follows, ignore_conflicts=True)
+    return len(follows)
+
+
+def run_chunk(task):
+    kind, index = task
+    if kind == 'recipes':
+        return generate_recipes(index)
+    if kind == 'follows':
+        return generate_follows(index)
+    model = Favorite if kind == 'favorites' else ShoppingCart
+    return generate_user_recipe_pairs(model, kind, index)
+
+
+def close_connections():
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерация пользователей, подписок, рецептов, избранного и '
+        'списков покупок для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--preset', choices=PRESETS, default='small',
+            help='Готовый набор объёмов данных.'
+        )
+        for kind in PRESETS['small']:
+            parser.add_argument(
+                f'--{kind}', type=int,
+                help=f'Переопределить количество ({kind}) из набора.'
+            )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество процессов для вставки данных.'
+        )
+
+    def handle(self, *args, **options):
+        sizes = {
+            kind: options[kind] if options[kind] is not None else size
+            for kind, size in PRESETS[options['preset']].items()
+        }
+        if not Ingredient.objects.exists() or not Tag.objects.exists():
+            raise CommandError(
+                'Сначала загрузите продукты и теги: '
+                'import_ingredients_data и import_tags_data.'
+            )
+        rng = random.Random(options['seed'])
+        STATE.clear()
+        STATE.update(sizes)
+        STATE.update(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            ingredients=list(
+                Ingredient.objects.order_by('pk').values_list('pk', 'name')
+            ),
+            tags=list(Tag.objects.order_by('pk').values_list('pk', flat=True)),
+            images=self.get_images(),
+        )
+        started = time.monotonic()
+        STATE['users'] = self.create_users(sizes['users'], options['seed'])
+        STATE['author_weights'] = power_law_cum_weights(
+            rng, len(STATE['users'])
+        )
+        STATE['first_recipe_id'] = (
+            Recipe.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            ).first() or 0
+        ) + 1
+        self.run('recipes', options['workers'])
+        self.reset_sequences()
+        STATE['recipe_ids'] = list(range(
+            STATE['first_recipe_id'],
+            STATE['first_recipe_id'] + sizes['recipes']
+        ))
+        STATE['recipe_weights'] = power_law_cum_weights(
+            rng, len(STATE['recipe_ids'])
+        )
+        for kind in ('follows', 'favorites', 'carts'):
+            self.run(kind, options['workers'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные сгенерированы за {time.monotonic() - started:.1f} с.'
+        ))
+
+    def get_images(self):
+        image_dir = Path(settings.MEDIA_ROOT) / 'recipes' / 'image'
+        images = sorted(
+            f'recipes/image/{path.name}' for path in image_dir.glob('*')
+            if path.is_file()
+        ) if image_dir.exists() else []
+        return images or ['recipes/image/fake.png']
+
+    def create_users(self, count, seed):
+        prefix = f'{USERNAME_PREFIX}{seed}_'
+        password = make_password(PASSWORD)
+        for batch_start in range(0, count, STATE['batch_size']):
+            User.objects.bulk_create(
+                (
+                    User(
+                        username=f'{prefix}{number}',
+                        email=f'{prefix}{number}@foodgram.fake',
+                        first_name=f'Имя{number}',
+                        last_name=f'Фамилия{number}',
+                        password=password,
+                    )
+                    for number in range(
+                        batch_start,
+                        min(batch_start + STATE['batch_size'], count)
+                    )
+                ),
+                ignore_conflicts=True,
+            )
+        self.stdout.write(f'Пользователи: {count}')
+        return list(User.objects.filter(
+            username__startswith=prefix
+        ).order_by('pk').values_list('pk', flat=True))
+
+    def run(self, kind, workers):
+        started = time.monotonic()
+        chunks = range(-(-STATE[kind] // STATE['batch_size']))
+        tasks = [(kind, index) for index in chunks]
+        if workers > 1:
+            close_connections()
+            with multiprocessing.get_context('fork').Pool(
+                workers, initializer=close_connections
+            ) as pool:
+                created = sum(pool.imap_unordered(run_chunk, tasks))
+        else:
+            created = sum(map(run_chunk, tasks))
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{kind}: {created} за {elapsed:.1f} с '
+            f'({created / elapsed if elapsed else 0:.0f} записей/с)'
+        )
+
+    def reset_sequences(self):
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [Recipe]
+            ):
+                cursor.execute(sql)
@@ -1,16 +1,96 @@
-import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
 
-from django.core.management.base import BaseCommand
+from recipes.management.base import BaseImportCommand
+from recipes.models import Ingredient, Recipe
+from recipes.nutrition import NUTRITION_FIELDS, update_nutrition
+from recipes.signals import ingredients_updated
 
-from recipes.models import Ingredient
+INGREDIENT_NUTRITION_FIELDS = tuple(NUTRITION_FIELDS.values())
 
 
-class Command(BaseCommand):
+class Command(BaseImportCommand):
+    help = (
+        'Загрузка продуктов из json, ndjson или csv файла. Необязательные '
+        'поля calories, proteins, fats, carbohydrates и price задаются на '
+        '100 единиц измерения и обновляют уже загруженные продукты; '
+        'незаданные поля не меняются.'
+    )
+    model = Ingredient
+    fields = ('name', 'measurement_unit', *INGREDIENT_NUTRITION_FIELDS)
+    default_path = settings.BASE_DIR / 'data' / 'ingredients.json'
+
+    def get_object(self, row):
+        ingredient = super().get_object(row)
+        for name in INGREDIENT_NUTRITION_FIELDS:
+            value = getattr(ingredient, name)
+            if value is None:
+                continue
+            try:
+                value = Ingredient._meta.get_field(name).clean(
+                    value, ingredient
+                )
+            except ValidationError as error:
+                raise ValueError(
+                    f'продукт "{ingredient.name}", поле {name}={value!r}: '
+                    f'{" ".join(error.messages)}'
+                )
+            setattr(ingredient, name, value)
+        return ingredient
+
+    def save_batch(self, ingredients):
+        super().save_batch(ingredients)
+        ingredients = [
+            ingredient for ingredient in ingredients
+            if any(
+                getattr(ingredient, field) is not None
+                for field in INGREDIENT_NUTRITION_FIELDS
+            )
+        ]
+        if not ingredients:
+            return
+        existing = {
+            (ingredient.name, ingredient.measurement_unit): ingredient
+            for ingredient in Ingredient.objects.filter(
+                name__in={ingredient.name for ingredient in ingredients}
+            ).only('name', 'measurement_unit', *INGREDIENT_NUTRITION_FIELDS)
+        }
+        changed = {}
+        for ingredient in ingredients:
+            stored = existing[(ingredient.name, ingredient.measurement_unit)]
+            fields = tuple(
+                field for field in INGREDIENT_NUTRITION_FIELDS
+                if getattr(ingredient, field) is not None
+                and getattr(ingredient, field) != getattr(stored, field)
+            )
+            if fields:
+                ingredient.pk = stored.pk
+                changed.setdefault(fields, []).append(ingredient)
+        if not changed:
+            return
+        ingredient_ids = set()
+        for fields, group in changed.items():
+            Ingredient.objects.bulk_update(group, fields)
+            ingredient_ids.update(ingredient.pk for ingredient in group)
+        recipe_ids = list(Recipe.objects.filter(
+            ingredients__in=ingredient_ids
+        ).values_list('pk', flat=True).distinct())
+        update_nutrition(Recipe.objects.filter(pk__in=recipe_ids))
+        ingredients_updated.send(
+            sender=Ingredient,
+            ingredient_ids=ingredient_ids,
+            recipe_ids=recipe_ids,
+        )
+        self.nutrition_updated += len(ingredient_ids)
+        self.recipes_updated.update(recipe_ids)
+
     def handle(self, *args, **options):
-        with open(
-            'data/ingredients.json', encoding='utf-8'
-        ) as data_file_ingredients:
-            ingredient_data = json.loads(data_file_ingredients.read())
-            Ingredient.objects.bulk_create(
-                Ingredient(**data) for data in ingredient_data
+        self.nutrition_updated = 0
+        self.recipes_updated = set()
+        super().handle(*args, **options)
+        if self.nutrition_updated:
+            self.stdout.write(
+                f'Пищевая ценность изменена у {self.nutrition_updated} '
+                f'продуктов, пересчитано рецептов: '
+                f'{len(self.recipes_updated)}.'
             )
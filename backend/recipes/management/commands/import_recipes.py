@@ -0,0 +1,164 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from recipes.management.base import BATCH_SIZE
+from recipes.management.commands.export_recipes import (
+    IMAGE_WORKERS,
+    copy_image,
+    wait_for_images
+)
+from recipes.management.readers import batched, iter_ndjson
+from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag, User
+from recipes.nutrition import update_nutrition
+
+
+class Command(BaseCommand):
+    help = 'Загрузка рецептов из ndjson файла, созданного export_recipes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к ndjson файлу.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--media-dir',
+            help='Каталог, из которого копируются изображения рецептов.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=IMAGE_WORKERS,
+            help='Количество потоков для копирования изображений.'
+        )
+
+    def handle(self, *args, **options):
+        self.authors = dict(User.objects.values_list('email', 'id'))
+        self.tags = dict(Tag.objects.values_list('slug', 'id'))
+        self.ingredients = {
+            (name, measurement_unit): pk
+            for pk, name, measurement_unit in Ingredient.objects.values_list(
+                'id', 'name', 'measurement_unit'
+            )
+        }
+        media_dir = options['media_dir']
+        images = []
+        imported = skipped = 0
+        started = time.monotonic()
+        try:
+            with open(options['path'], encoding='utf-8') as data_file, \
+                    ThreadPoolExecutor(options['workers']) as executor:
+                for batch in batched(
+                    iter_ndjson(data_file), options['batch_size']
+                ):
+                    rows = [row for row in batch if self.is_valid(row)]
+                    skipped += len(batch) - len(rows)
+                    with transaction.atomic():
+                        self.import_batch(rows)
+                    if media_dir:
+                        images.extend(
+                            (row['image'], executor.submit(
+                                copy_image, row['image'],
+                                media_dir, settings.MEDIA_ROOT
+                            ))
+                            for row in rows
+                        )
+                    imported += len(rows)
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f'Загружено {imported} рецептов '
+                        f'({imported / elapsed:.0f} рецептов/с)'
+                    )
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(
+                f'Ошибка загрузки после {imported} рецептов: {error}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {imported} рецептов, пропущено {skipped}.'
+        ))
+        if media_dir:
+            self.report_images(images)
+
+    def report_images(self, images):
+        copied, failed = wait_for_images(images)
+        for error in failed:
+            self.stderr.write(f'Изображение не скопировано: {error}')
+        style = self.style.ERROR if failed else self.style.SUCCESS
+        self.stdout.write(style(
+            f'Скопировано {copied} изображений, ошибок {len(failed)}.'
+        ))
+
+    def is_valid(self, row):
+        missing = []
+        if row['author'] not in self.authors:
+            missing.append(f'автор {row["author"]}')
+        missing.extend(
+            f'тег {slug}' for slug in row['tags'] if slug not in self.tags
+        )
+        missing.extend(
+            f'продукт {item["name"]}' for item in row['ingredients']
+            if (item['name'], item['measurement_unit'])
+            not in self.ingredients
+        )
+        ingredients = [
+            (item['name'], item['measurement_unit'])
+            for item in row['ingredients']
+        ]
+        repeated = sorted({
+            name for name, unit in ingredients
+            if ingredients.count((name, unit)) > 1
+        })
+        problems = []
+        if missing:
+            problems.append(f'не найдены {", ".join(missing)}')
+        if repeated:
+            problems.append(f'повторяются продукты {", ".join(repeated)}')
+        if problems:
+            self.stderr.write(
+                f'Рецепт "{row["name"]}" пропущен: {"; ".join(problems)}.'
+            )
+        return not problems
+
+    def create_recipes(self, recipes):
+        if connection.features.can_return_rows_from_bulk_insert:
+            return Recipe.objects.bulk_create(recipes)
+        for recipe in recipes:
+            recipe.save(force_insert=True)
+        return recipes
+
+    def import_batch(self, rows):
+        recipes = self.create_recipes([
+            Recipe(
+                author_id=self.authors[row['author']],
+                name=row['name'],
+                text=row['text'],
+                cooking_time=row['cooking_time'],
+                image=row['image'],
+            )
+            for row in rows
+        ])
+        dated = []
+        for recipe, row in zip(recipes, rows):
+            if row.get('pub_date'):
+                recipe.pub_date = parse_datetime(row['pub_date'])
+                dated.append(recipe)
+        Recipe.objects.bulk_update(dated, ('pub_date',))
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe.pk, tag_id=self.tags[slug])
+            for recipe, row in zip(recipes, rows)
+            for slug in set(row['tags'])
+        ])
+        IngredientRecipe.objects.bulk_create([
+            IngredientRecipe(
+                recipe_id=recipe.pk,
+                ingredient_id=self.ingredients[
+                    (item['name'], item['measurement_unit'])
+                ],
+                amount=item['amount'],
+            )
+            for recipe, row in zip(recipes, rows)
+            for item in row['ingredients']
+        ])
+        update_nutrition(
+            Recipe.objects.filter(pk__in=[recipe.pk for recipe in recipes])
+        )
@@ -1,14 +1,11 @@
-import json
-
-from django.core.management.base import BaseCommand
+from django.conf import settings
 
+from recipes.management.base import BaseImportCommand
 from recipes.models import Tag
 
 
-class Command(BaseCommand):
-    def handle(self, *args, **options):
-        with open('data/tags.json', encoding='utf-8') as data_file_tags:
-            tags_data = json.loads(data_file_tags.read())
-            Tag.objects.bulk_create(
-                Tag(**data) for data in tags_data
-            )
+class Command(BaseImportCommand):
+    help = 'Загрузка тегов из json, ndjson или csv файла.'
+    model = Tag
+    fields = ('name', 'color', 'slug')
+    default_path = settings.BASE_DIR / 'data' / 'tags.json'
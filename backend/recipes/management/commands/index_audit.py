@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+UNUSED_INDEXES_SQL = '''
+    SELECT s.relname, s.indexrelname, s.idx_scan,
+           pg_relation_size(s.indexrelid)
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    WHERE s.idx_scan <= %s
+      AND NOT i.indisunique
+      AND NOT i.indisprimary
+    ORDER BY pg_relation_size(s.indexrelid) DESC
+'''
+SEQ_SCANS_SQL = '''
+    SELECT relname, seq_scan, seq_tup_read, COALESCE(idx_scan, 0), n_live_tup
+    FROM pg_stat_user_tables
+    WHERE seq_scan > 0 AND n_live_tup >= %s
+    ORDER BY seq_tup_read DESC
+'''
+STATS_RESET_SQL = '''
+    SELECT stats_reset FROM pg_stat_database
+    WHERE datname = current_database()
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Поиск неиспользуемых индексов и таблиц с последовательным '
+        'сканированием по статистике PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-scans', type=int, default=0,
+            help='Индекс считается неиспользуемым при idx_scan не больше.'
+        )
+        parser.add_argument(
+            '--min-rows', type=int, default=1000,
+            help='Не показывать таблицы меньше указанного числа строк.'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError(
+                'Аудит индексов доступен только для PostgreSQL.'
+            )
+        with connection.cursor() as cursor:
+            cursor.execute(STATS_RESET_SQL)
+            row = cursor.fetchone()
+            self.stdout.write(
+                f'Статистика собирается с {row[0] if row else "неизвестно"}.'
+            )
+            cursor.execute(UNUSED_INDEXES_SQL, [options['max_scans']])
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                'Неиспользуемые индексы:'
+            ))
+            for table, index, scans, size in cursor.fetchall():
+                self.stdout.write(
+                    f'  {table}.{index}: {scans} сканирований, '
+                    f'{size / 1024:.0f} КБ'
+                )
+            cursor.execute(SEQ_SCANS_SQL, [options['min_rows']])
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                'Последовательные сканирования:'
+            ))
+            for table, seq_scans, rows_read, idx_scans, rows in (
+                cursor.fetchall()
+            ):
+                self.stdout.write(
+                    f'  {table}: {seq_scans} seq scan '
+                    f'({rows_read} строк прочитано), {idx_scans} index scan, '
+                    f'{rows} строк в таблице'
+                )
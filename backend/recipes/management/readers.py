@@ -0,0 +1,82 @@
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+FORMATS = ('json', 'ndjson', 'csv')
+EXTENSIONS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+}
+
+
+def detect_format(path):
+    return EXTENSIONS.get(Path(path).suffix.lower(), 'json')
+
+
+def iter_json_array(data_file, chunk_size=CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = data_file.read(chunk_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Ожидается JSON-массив объектов.')
+    buffer = buffer[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith(','):
+            buffer = buffer[1:].lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = data_file.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield item
+        buffer = buffer[end:]
+
+
+def iter_ndjson(data_file):
+    for line in data_file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def is_header(row, fieldnames):
+    values = list(row.values())
+    while values and values[-1] in (None, ''):
+        values.pop()
+    return bool(values) and values == list(fieldnames[:len(values)])
+
+
+def iter_csv(data_file, fieldnames):
+    reader = csv.DictReader(data_file, fieldnames=fieldnames)
+    for row in reader:
+        if is_header(row, fieldnames):
+            continue
+        yield row
+
+
+def iter_rows(data_file, data_format, fieldnames):
+    if data_format == 'csv':
+        return iter_csv(data_file, fieldnames)
+    if data_format == 'ndjson':
+        return iter_ndjson(data_file)
+    return iter_json_array(data_file)
+
+
+def batched(iterable, batch_size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+INDEXES = {
+    'user_username_upper_prefix_idx': 'username',
+    'user_email_upper_prefix_idx': 'email',
+}
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON recipes_user '
+            f'(UPPER({column}::text) varchar_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0012_ingredient_name_prefix_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
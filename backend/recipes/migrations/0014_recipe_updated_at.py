@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:50
+
+from django.db import migrations, models
+
+
+def copy_pub_date(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Recipe.objects.update(updated_at=models.F('pub_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0013_user_prefix_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(copy_pub_date, migrations.RunPython.noop),
+    ]
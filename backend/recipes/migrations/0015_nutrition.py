@@ -0,0 +1,64 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:04
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0014_recipe_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='calories',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Калорийность, ккал на 100 единиц'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='carbohydrates',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Углеводы, г на 100 единиц'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='fats',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Жиры, г на 100 единиц'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Цена, руб. на 100 единиц'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='proteins',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Белки, г на 100 единиц'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='calories',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12, verbose_name='Калорийность, ккал'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='carbohydrates',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12, verbose_name='Углеводы, г'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='cost',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12, verbose_name='Стоимость, руб.'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='fats',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12, verbose_name='Жиры, г'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='proteins',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12, verbose_name='Белки, г'),
+        ),
+    ]
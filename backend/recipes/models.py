@@ -58,6 +58,12 @@ class Follow(models.Model):
 
     class Meta:
         ordering = ('user',)
+        indexes = [
+            models.Index(
+                fields=('author', 'user'),
+                name='follow_author_user_idx'
+            ),
+        ]
         constraints = [
             UniqueConstraint(
                 fields=('user', 'author'),
@@ -85,6 +91,46 @@ class Ingredient(models.Model):
         max_length=200,
         verbose_name='Единица измерения'
     )
+    calories = models.DecimalField(
+        verbose_name='Калорийность, ккал на 100 единиц',
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=(MinValueValidator(0),)
+    )
+    proteins = models.DecimalField(
+        verbose_name='Белки, г на 100 единиц',
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=(MinValueValidator(0),)
+    )
+    fats = models.DecimalField(
+        verbose_name='Жиры, г на 100 единиц',
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=(MinValueValidator(0),)
+    )
+    carbohydrates = models.DecimalField(
+        verbose_name='Углеводы, г на 100 единиц',
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=(MinValueValidator(0),)
+    )
+    price = models.DecimalField(
+        verbose_name='Цена, руб. на 100 единиц',
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=(MinValueValidator(0),)
+    )
 
     class Meta():
         verbose_name = 'Продукт'
@@ -166,9 +212,58 @@ class Recipe(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
+    calories = models.DecimalField(
+        verbose_name='Калорийность, ккал',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False
+    )
+    proteins = models.DecimalField(
+        verbose_name='Белки, г',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False
+    )
+    fats = models.DecimalField(
+        verbose_name='Жиры, г',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False
+    )
+    carbohydrates = models.DecimalField(
+        verbose_name='Углеводы, г',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False
+    )
+    cost = models.DecimalField(
+        verbose_name='Стоимость, руб.',
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=('-pub_date',),
+                name='recipe_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='recipe_author_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Рецепт',
         verbose_name_plural = 'Рецепты'
 
@@ -247,6 +342,12 @@ class IngredientRecipe(models.Model):
         ordering = ('recipe', )
         verbose_name = 'Продукт'
         verbose_name_plural = 'Меры продуктов в рецепте'
+        indexes = [
+            models.Index(
+                fields=('recipe', 'ingredient', 'amount'),
+                name='ingredientrecipe_amount_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['recipe', 'ingredient'],
@@ -0,0 +1,54 @@
+from django.db.models import (
+    DecimalField,
+    F,
+    Func,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value
+)
+from django.db.models.functions import Coalesce
+
+from .models import IngredientRecipe, Recipe
+
+NUTRITION_FIELDS = {
+    'calories': 'calories',
+    'proteins': 'proteins',
+    'fats': 'fats',
+    'carbohydrates': 'carbohydrates',
+    'cost': 'price',
+}
+NUTRITION_UNITS = 100
+NUTRITION_DECIMAL_PLACES = 2
+
+
+def get_total(ingredient_field):
+    output_field = DecimalField(
+        max_digits=12, decimal_places=NUTRITION_DECIMAL_PLACES
+    )
+    totals = IngredientRecipe.objects.filter(
+        recipe=OuterRef('pk')
+    ).order_by().values('recipe').annotate(total=Func(
+        Sum(
+            F('amount') * F(f'ingredient__{ingredient_field}')
+            / NUTRITION_UNITS,
+            output_field=output_field,
+        ),
+        Value(NUTRITION_DECIMAL_PLACES),
+        function='ROUND',
+        output_field=output_field,
+    )).values('total')
+    return Coalesce(
+        Subquery(totals, output_field=output_field),
+        Value(0),
+        output_field=output_field,
+    )
+
+
+def update_nutrition(recipes=None):
+    if recipes is None:
+        recipes = Recipe.objects.all()
+    return recipes.update(**{
+        recipe_field: get_total(ingredient_field)
+        for recipe_field, ingredient_field in NUTRITION_FIELDS.items()
+    })
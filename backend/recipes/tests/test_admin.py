@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.tests.base import FoodgramTestCase, create_user
+from recipes.models import Favorite, Follow, ShoppingCart, User
+
+CHANGELIST_QUERIES = 7
+
+CHANGELISTS = (
+    '/admin/recipes/user/',
+    '/admin/recipes/user/?subscriptions_followers=has_subscriptions',
+    '/admin/recipes/user/?subscriptions_followers=has_followers',
+    '/admin/recipes/user/?subscriptions_followers=top_authors',
+    '/admin/recipes/recipe/?author=author0',
+    '/admin/recipes/favorite/?username=user',
+    '/admin/recipes/shoppingcart/?username=user&recipe_id={recipe}',
+)
+
+
+class AdminChangelistTests(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser(
+            email='admin@foodgram.test',
+            username='admin',
+            first_name='admin',
+            last_name='admin',
+            password='password',
+        ))
+
+    def count_queries(self):
+        counts = {}
+        for url in CHANGELISTS:
+            url = url.format(recipe=self.recipes[0].pk)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            counts[url] = len(queries)
+        return counts
+
+    def test_query_count_is_bounded(self):
+        counts = self.count_queries()
+        for url, count in counts.items():
+            with self.subTest(url=url):
+                self.assertLessEqual(count, CHANGELIST_QUERIES)
+        for number in range(10):
+            user = create_user(f'follower{number}')
+            for author in self.authors:
+                Follow.objects.create(user=user, author=author)
+            for recipe in self.recipes:
+                Favorite.objects.create(user=user, recipe=recipe)
+                ShoppingCart.objects.create(user=user, recipe=recipe)
+        cache.clear()
+        self.assertEqual(self.count_queries(), counts)
+
+    def test_subscriptions_followers_filter(self):
+        for value, users in (
+            ('has_subscriptions', [self.user]),
+            ('has_followers', self.authors[:2]),
+            ('top_authors', self.authors[:2]),
+        ):
+            with self.subTest(value=value):
+                response = self.client.get(
+                    '/admin/recipes/user/',
+                    {'subscriptions_followers': value}
+                )
+                self.assertCountEqual(
+                    response.context['cl'].result_list, users
+                )
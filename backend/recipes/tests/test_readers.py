@@ -0,0 +1,39 @@
+import io
+
+from django.test import SimpleTestCase
+
+from recipes.management.readers import iter_csv
+
+FIELDNAMES = (
+    'name',
+    'measurement_unit',
+    'calories',
+    'proteins',
+    'fats',
+    'carbohydrates',
+    'price',
+)
+
+
+class CsvReaderTests(SimpleTestCase):
+    def read(self, text):
+        return list(iter_csv(io.StringIO(text), FIELDNAMES))
+
+    def test_headers_are_skipped(self):
+        for header in (
+            'name,measurement_unit\n',
+            'name,measurement_unit,calories\n',
+            f'{",".join(FIELDNAMES)}\n',
+            'name,measurement_unit,,,,,\n',
+        ):
+            with self.subTest(header=header):
+                rows = self.read(f'{header}мука,г\nсахар,г,387,,,,\n')
+                self.assertEqual(
+                    [(row['name'], row['measurement_unit']) for row in rows],
+                    [('мука', 'г'), ('сахар', 'г')]
+                )
+                self.assertEqual(rows[1]['calories'], '387')
+
+    def test_without_header(self):
+        rows = self.read('name,г\nмука,г\n')
+        self.assertEqual([row['name'] for row in rows], ['name', 'мука'])